@@ -0,0 +1,249 @@
+# 요구사항: PR-0001
+"""감시 → 실행 → 이동 전체 처리 과정의 처리량/지연 시간 벤치마크입니다.
+
+config.py 의 개발용 템플릿으로 임시 설정을 만들고, WatcherService 와 TaskManager 를
+같은 프로세스에서 실행합니다. app 은 아무 일도 하지 않는 /bin/true 를 사용하므로
+측정값은 folder-watcher 자체의 비용입니다.
+
+    python3 -m dev.benchmarks.pipeline                       # 모든 시나리오
+    python3 -m dev.benchmarks.pipeline -s burst -s backlog --files 5000 --output bench.json
+
+결과는 JSON 파일로 저장되며, 변경 전후 결과를 비교하는 데 사용합니다.
+"""
+import argparse
+import configparser
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from dev.folder_watcher.config import get_config_templates
+from dev.folder_watcher.task_manager import TaskManager
+from dev.folder_watcher.watcher_service import WatcherService
+
+PATTERNS = ('close', 'hardlink', 'rename', 'move')
+SCENARIOS = ('burst', 'backlog', 'many_tasks', 'large_files')
+COMPLETE_TIMEOUT = 600      # 초
+
+def build_config(work_dir, num_tasks, app='/bin/true', max_jobs=None, quiet_period=None):
+    """개발용 설정 템플릿을 바탕으로 work_dir 아래에 임시 설정과 폴더를 만듭니다."""
+    config = configparser.ConfigParser()
+    config.read_string(get_config_templates(dev_mode=True))
+    template = dict(config['0'])
+    config.remove_section('0')
+
+    common = config['common']
+    common['tasks'] = str(num_tasks)
+    for key in ('pids', 'logs'):
+        common[key] = os.path.join(work_dir, key)
+        os.makedirs(common[key], exist_ok=True)
+    common['journal'] = os.path.join(work_dir, 'journal.db')
+    common['credential'] = os.path.join(work_dir, 'cred')
+    if max_jobs:
+        common['max_jobs'] = str(max_jobs)
+
+    for i in range(num_tasks):
+        task = dict(template, name=f"Bench {i}", app=app, param='', interval='0')
+        for key in ('in', 'done', 'stop'):
+            task[key] = os.path.join(work_dir, f"task{i}", key)
+            os.makedirs(task[key], exist_ok=True)
+        if quiet_period is not None:
+            task['quiet_period'] = str(quiet_period)
+        config[str(i)] = task
+    return config
+
+def drop_file(folder, staging, name, payload, pattern):
+    """pattern 에 맞는 방식으로 파일을 유입 폴더에 넣습니다."""
+    path = os.path.join(folder, name)
+    if pattern == 'close':          # 유입 폴더에 직접 쓰고 닫음 ('closed' 이벤트)
+        with open(path, 'wb') as f:
+            f.write(payload)
+    elif pattern == 'hardlink':     # 다른 폴더에 쓴 뒤 하드링크 ('created', nlink > 1)
+        staged = os.path.join(staging, name)
+        with open(staged, 'wb') as f:
+            f.write(payload)
+        os.link(staged, path)
+        os.unlink(staged)
+    elif pattern == 'rename':       # rsync 처럼 숨김 임시 파일에 쓴 뒤 rename ('moved')
+        partial = os.path.join(folder, f".{name}.partial")
+        with open(partial, 'wb') as f:
+            f.write(payload)
+        os.rename(partial, path)
+    elif pattern == 'move':         # 감시하지 않는 폴더에서 rename ('created', 대기 시간 후 제출)
+        staged = os.path.join(staging, name)
+        with open(staged, 'wb') as f:
+            f.write(payload)
+        os.rename(staged, path)
+    else:
+        raise ValueError(f"알 수 없는 패턴: {pattern}")
+    return path
+
+def percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'max': values[-1],
+            'mean': sum(values) / len(values)}
+
+def _rss_kb():
+    status = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            status[key] = value.split()[0] if value.split() else None
+    return int(status.get('VmRSS') or 0), int(status.get('VmHWM') or 0)
+
+def _count_finished(config, num_tasks):
+    count = 0
+    for i in range(num_tasks):
+        for key in ('done', 'stop'):
+            with os.scandir(config[str(i)][key]) as entries:
+                count += sum(1 for entry in entries if not entry.name.startswith('.'))
+    return count
+
+def _journal_times(path):
+    """journal 에서 {유입 파일 경로: (detected_at, moved_at)} 을 읽습니다."""
+    conn = sqlite3.connect(path)
+    try:
+        return {file_path: (detected_at, moved_at) for file_path, detected_at, moved_at in
+                conn.execute("SELECT file_path, detected_at, moved_at FROM jobs WHERE moved_at IS NOT NULL")}
+    finally:
+        conn.close()
+
+def run_scenario(name, work_dir, files, num_tasks, size, rate, pattern, backlog, max_jobs, quiet_period):
+    """시나리오 하나를 실행하고 측정 결과를 반환합니다."""
+    config = build_config(work_dir, num_tasks, max_jobs=max_jobs, quiet_period=quiet_period)
+    staging = os.path.join(work_dir, 'staging')
+    os.makedirs(staging, exist_ok=True)
+    payload = os.urandom(min(size, 1024 * 1024))
+    payload = payload * (size // len(payload)) + payload[:size % len(payload)] if size else b''
+    dropped = {}
+
+    def drop_all():
+        interval = 1.0 / rate if rate else 0.0
+        start = time.monotonic()
+        for n in range(files):
+            if interval:
+                delay = start + n * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            task_id = str(n % num_tasks)
+            dropped_at = time.time()
+            path = drop_file(config[task_id]['in'], staging, f"f{n:08d}", payload, pattern)
+            dropped[path] = dropped_at
+
+    if backlog:
+        drop_all()      # 시작 전에 쌓인 파일
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.time()
+    task_manager = TaskManager(config)
+    watcher_service = WatcherService(config, task_manager)
+    watcher_service.start()
+    if backlog:
+        dropped = dict.fromkeys(dropped, started)
+    else:
+        drop_all()
+
+    deadline = time.monotonic() + COMPLETE_TIMEOUT
+    while _count_finished(config, num_tasks) < files and time.monotonic() < deadline:
+        time.sleep(0.05)
+    elapsed = time.time() - started
+    finished = _count_finished(config, num_tasks)
+
+    watcher_service.stop()
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    rss, rss_peak = _rss_kb()
+
+    times = _journal_times(config['common']['journal'])
+    latency, detection = [], []
+    for path, dropped_at in dropped.items():
+        if path in times:
+            detected_at, moved_at = times[path]
+            latency.append(moved_at - dropped_at)
+            if not backlog:
+                detection.append(detected_at - dropped_at)
+
+    return {
+        'scenario': name,
+        'params': {'files': files, 'tasks': num_tasks, 'size': size, 'rate': rate, 'pattern': pattern,
+                   'backlog': backlog, 'max_jobs': task_manager.max_jobs, 'quiet_period': quiet_period},
+        'finished': finished,
+        'timed_out': finished < files,
+        'seconds': elapsed,
+        'files_per_second': finished / elapsed if elapsed else None,
+        'latency_seconds': percentiles(latency),
+        'detection_latency_seconds': percentiles(detection),
+        'cpu_seconds': {
+            'user': usage_after.ru_utime - usage.ru_utime,
+            'system': usage_after.ru_stime - usage.ru_stime,
+            'children': (children_after.ru_utime - children.ru_utime) + (children_after.ru_stime - children.ru_stime),
+        },
+        'rss_kb': rss,
+        'rss_peak_kb': rss_peak,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="folder-watcher 처리 과정 벤치마크")
+    parser.add_argument('-s', '--scenario', action='append', choices=SCENARIOS,
+                        help="실행할 시나리오 (여러 번 지정 가능, 기본값: 전체)")
+    parser.add_argument('--files', type=int, default=2000, help="시나리오별 파일 수")
+    parser.add_argument('--rate', type=float, default=0, help="초당 넣을 파일 수 (0 이면 최대한 빠르게)")
+    parser.add_argument('--size', type=int, default=4096, help="파일 크기(바이트)")
+    parser.add_argument('--pattern', choices=PATTERNS, default='close', help="파일을 넣는 방식")
+    parser.add_argument('--tasks', type=int, default=50, help="many_tasks 시나리오의 작업 수")
+    parser.add_argument('--large-size', type=int, default=256 * 1024 * 1024, help="large_files 시나리오의 파일 크기")
+    parser.add_argument('--large-files', type=int, default=8, help="large_files 시나리오의 파일 수")
+    parser.add_argument('--max-jobs', type=int, default=None, help="[common] max_jobs (기본값: 템플릿 값)")
+    parser.add_argument('--quiet-period', type=float, default=None, help="move 패턴에 적용할 quiet_period")
+    parser.add_argument('--work-dir', default=None, help="임시 폴더를 만들 위치 (기본값: 시스템 임시 폴더)")
+    parser.add_argument('--output', default='bench_results.json', help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    scenarios = {
+        'burst':       dict(files=args.files, num_tasks=1, size=args.size, rate=args.rate, backlog=False),
+        'backlog':     dict(files=args.files, num_tasks=1, size=args.size, rate=0, backlog=True),
+        'many_tasks':  dict(files=args.files, num_tasks=args.tasks, size=args.size, rate=args.rate, backlog=False),
+        'large_files': dict(files=args.large_files, num_tasks=1, size=args.large_size, rate=0, backlog=False),
+    }
+    selected = args.scenario or list(SCENARIOS)
+
+    results = []
+    for name in selected:
+        work_dir = tempfile.mkdtemp(prefix=f"fw-bench-{name}-", dir=args.work_dir)
+        logging.basicConfig(filename=os.path.join(work_dir, 'bench.log'), level=logging.INFO, force=True,
+                            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        try:
+            result = run_scenario(name, work_dir, pattern=args.pattern, max_jobs=args.max_jobs,
+                                  quiet_period=args.quiet_period, **scenarios[name])
+        finally:
+            logging.shutdown()
+            shutil.rmtree(work_dir, ignore_errors=True)
+        results.append(result)
+        latency = result['latency_seconds'] or {}
+        print(f"{name:12s} {result['finished']:6d}/{result['params']['files']:<6d} "
+              f"{result['files_per_second'] or 0:9.1f} files/s  "
+              f"p50 {latency.get('p50', 0) * 1000:8.1f} ms  p99 {latency.get('p99', 0) * 1000:8.1f} ms  "
+              f"cpu {result['cpu_seconds']['user'] + result['cpu_seconds']['system']:6.2f} s  "
+              f"rss {result['rss_kb'] / 1024:6.1f} MiB")
+
+    report = {
+        'created_at': time.time(),
+        'host': {'platform': platform.platform(), 'python': sys.version.split()[0], 'cpu_count': os.cpu_count()},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과를 저장했습니다: {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,10 @@ import logging
 import sys
 import os
 import argparse
+import signal
 
 # 경로 문제를 피하기 위해 패키지 이름을 직접 지정
-from dev.folder_watcher.config import load_config
+from dev.folder_watcher.config import load_config, get_config_path
 from dev.folder_watcher.logger import setup_logging
 from dev.folder_watcher.task_manager import TaskManager
 from dev.folder_watcher.watcher_service import WatcherService
@@ -29,22 +30,38 @@ def main():
         sys.stderr.write(f"초기화 실패: {e}\n")
         sys.exit(1)
 
-    app = create_app(config)
-    logging.getLogger('werkzeug').setLevel(logging.ERROR)   # Suppress Werkzeug logs
-
+    task_manager = None
     if not args.dev or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
         task_manager = TaskManager(config)
-        watcher_service = WatcherService(config, task_manager)
+
+    watcher_service = None
+    if task_manager is not None:
+        # 설정 파일이 바뀌면 바뀐 작업만 다시 시작 (웹 UI 의 /api/reload 로도 가능)
+        watcher_service = WatcherService(config, task_manager, config_path=get_config_path())
+
+    app = create_app(config, task_manager, reload_config=watcher_service.reload if watcher_service else None)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)   # Suppress Werkzeug logs
+
+    if task_manager is not None:
         watcher_thread = threading.Thread(target=watcher_service.start, name="WatcherThread", daemon=True)
         watcher_thread.start()
         logging.info(f"Folder-Watcher를 시작합니다. (모드: {'개발' if args.dev else '배포'})")
         logging.info("웹 UI를 http://0.0.0.0:5000 에서 시작합니다.")
 
-    app.run(host='0.0.0.0', port=5000, debug=args.dev)
+    # SIGTERM(systemctl stop 등)도 Ctrl+C 와 같이 정상 종료 절차를 거치도록 함
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handle_sigterm)
 
-    if not args.dev or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
-        watcher_service.stop()
-        logging.info("Folder-Watcher를 종료합니다.")
+    try:
+        app.run(host='0.0.0.0', port=5000, debug=args.dev)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if task_manager is not None:
+            # 새 파일 감시를 멈추고 실행 중인 작업을 기다린 뒤 종료 (남은 작업은 다음 시작 시 넘겨받음)
+            watcher_service.stop()
+            logging.info("Folder-Watcher를 종료합니다.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
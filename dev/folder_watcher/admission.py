@@ -0,0 +1,170 @@
+# 요구사항: PR-0001, FR-0006
+import logging
+import os
+
+SAMPLE_INTERVAL = 1.0                   # 초, /proc 을 다시 읽는 최소 간격 (실행 판단을 다시 하는 주기)
+DEFAULT_MEM_RESERVE = 256 * 1024 * 1024 # 항상 남겨 둘 사용 가능 메모리
+DEFAULT_LOAD_FACTOR = 2.0               # max_load 기본값 = CPU 수 x 이 값
+SIZE_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+CGROUP_CONTROLLERS = ('cpu', 'memory')
+CPU_PERIOD = 100000                     # cpu.max 의 주기 (마이크로초)
+MEMORY_BUCKETS = tuple(2 ** n * 1024 * 1024 for n in range(2, 17, 2))    # 4 MiB ~ 64 GiB
+
+def parse_size(value):
+    """'512M', '2G', '1.5GiB', '1048576' 형식의 크기를 바이트로 변환합니다."""
+    text = str(value).strip().upper().removesuffix('B').removesuffix('I')
+    unit = SIZE_UNITS.get(text[-1:], 1)
+    return int(float(text[:-1] if unit > 1 else text) * unit)
+
+def read_meminfo():
+    """/proc/meminfo 의 값을 바이트 단위 {항목: 값} 으로 반환합니다."""
+    info = {}
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                fields = value.split()
+                if fields:
+                    info[key] = int(fields[0]) * 1024
+    except (OSError, ValueError):
+        pass
+    return info
+
+def read_loadavg():
+    """최근 1분 부하 평균을 반환합니다. 알 수 없으면 None."""
+    try:
+        with open('/proc/loadavg') as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class AdmissionController:
+    """새 실행을 지금 시작해도 되는지 자원 기준으로 판단합니다.
+
+    작업별 힌트(cpu: 코어 수, mem: 최대 메모리)를 실행 중인 동안 예약하고, 예약 합계가
+    cpu_budget/mem_budget 을 넘지 않을 때만 시작합니다. 또한 /proc/meminfo 의 MemAvailable 이
+    mem_reserve 보다 적거나 /proc/loadavg 가 max_load 이상이면 새 실행을 미룹니다.
+    힌트가 예산보다 큰 작업도 실행 중인 작업이 없으면 시작합니다.
+    TaskScheduler 의 잠금 안에서 호출됩니다.
+    """
+    def __init__(self, config):
+        self.reservations = {}      # 실행 키 -> (cpu, mem)
+        self.cpu_reserved = 0.0
+        self.mem_reserved = 0
+        self.mem_available = None
+        self.load = None
+        self._sampled_at = float('-inf')
+        self.configure(config)
+
+    def configure(self, config):
+        """[common] 의 예산 설정을 읽습니다. 설정을 다시 읽을 때도 호출됩니다."""
+        cpu_count = os.cpu_count() or 1
+        self.mem_total = read_meminfo().get('MemTotal', 0)
+        self.cpu_budget = config.getfloat('common', 'cpu_budget', fallback=float(cpu_count))
+        self.mem_budget = parse_size(config.get('common', 'mem_budget', fallback=str(self.mem_total)))
+        self.mem_reserve = parse_size(config.get('common', 'mem_reserve', fallback=str(DEFAULT_MEM_RESERVE)))
+        # 0 이면 부하 평균은 보지 않음
+        self.max_load = config.getfloat('common', 'max_load', fallback=cpu_count * DEFAULT_LOAD_FACTOR)
+
+    def sample(self, now):
+        if now - self._sampled_at < SAMPLE_INTERVAL:
+            return
+        self._sampled_at = now
+        self.mem_available = read_meminfo().get('MemAvailable')
+        self.load = read_loadavg()
+
+    def admit(self, key, cpu, mem, now):
+        """자원이 충분하면 예약하고 True 를 반환합니다."""
+        idle = not self.reservations
+        if not idle and (self.cpu_reserved + cpu > self.cpu_budget + 1e-9 or self.mem_reserved + mem > self.mem_budget):
+            return False
+        self.sample(now)
+        if self.mem_available is not None and self.mem_available - (0 if idle else mem) < self.mem_reserve:
+            return False
+        if not idle and self.max_load and self.load is not None and self.load >= self.max_load:
+            return False
+        self.reserve(key, cpu, mem)
+        return True
+
+    def reserve(self, key, cpu, mem):
+        """판단 없이 예약합니다 (이전 실행에서 넘겨받은 작업)."""
+        self.reservations[key] = (cpu, mem)
+        self.cpu_reserved += cpu
+        self.mem_reserved += mem
+
+    def release(self, key):
+        cpu, mem = self.reservations.pop(key, (0.0, 0))
+        self.cpu_reserved = max(0.0, self.cpu_reserved - cpu) if self.reservations else 0.0
+        self.mem_reserved = max(0, self.mem_reserved - mem) if self.reservations else 0
+
+
+class JobCgroups:
+    """[common] cgroup 폴더(cgroup v2) 아래에 실행별 cgroup 을 만들어 제한을 걸고 실제 사용량을 읽습니다.
+
+    폴더는 서비스 사용자에게 위임(systemd Delegate=yes 등)되어 있어야 하며, 사용할 수 없으면
+    경고를 남기고 cgroup 없이 실행합니다.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.enabled = False
+        try:
+            with open(os.path.join(root, 'cgroup.controllers')) as f:
+                available = f.read().split()
+            wanted = [name for name in CGROUP_CONTROLLERS if name in available]
+            with open(os.path.join(root, 'cgroup.subtree_control'), 'w') as f:
+                f.write(' '.join(f"+{name}" for name in wanted))
+            self.enabled = True
+            logging.info(f"실행별 cgroup 을 사용합니다: {root} (컨트롤러: {', '.join(wanted) or '-'})")
+        except OSError as e:
+            logging.warning(f"cgroup 폴더를 사용할 수 없어 cgroup 없이 실행합니다 ({root}): {e}")
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def create(self, name, cpu_limit=0.0, mem_limit=0):
+        """cgroup 을 만들고 경로를 반환합니다. 만들 수 없으면 None."""
+        if not self.enabled:
+            return None
+        path = self.path(name)
+        try:
+            os.makedirs(path, exist_ok=True)
+            if cpu_limit > 0:
+                self._write(path, 'cpu.max', f"{int(cpu_limit * CPU_PERIOD)} {CPU_PERIOD}")
+            if mem_limit > 0:
+                self._write(path, 'memory.max', str(mem_limit))
+        except OSError as e:
+            logging.warning(f"cgroup 을 만들 수 없습니다 ({path}): {e}")
+            self.remove(path)
+            return None
+        return path
+
+    def _write(self, path, name, value):
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(value)
+
+    def usage(self, path):
+        """(CPU 시간(초), 최대 메모리(바이트)) 를 반환합니다. 읽을 수 없는 값은 None."""
+        cpu_seconds = memory_peak = None
+        try:
+            with open(os.path.join(path, 'cpu.stat')) as f:
+                for line in f:
+                    key, _, value = line.partition(' ')
+                    if key == 'usage_usec':
+                        cpu_seconds = int(value) / 1e6
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(os.path.join(path, 'memory.peak')) as f:    # Linux 5.19 이상
+                memory_peak = int(f.read())
+        except (OSError, ValueError):
+            pass
+        return cpu_seconds, memory_peak
+
+    def remove(self, path):
+        try:
+            os.rmdir(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"cgroup 을 삭제할 수 없습니다 ({path}): {e}")
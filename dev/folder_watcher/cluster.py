@@ -0,0 +1,180 @@
+# 요구사항: FR-0005, FR-0006
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+CLAIM_DIR = '.claimed'          # 유입 폴더 아래 노드별 작업 폴더 (숨김 폴더라 감시 대상에서 제외됨)
+HEARTBEAT_SUFFIX = '.heartbeat'
+DEFAULT_LEASE_TIMEOUT = 60.0    # 초
+RUNNING_JOBS_LIMIT = 100        # heartbeat 에 기록할 실행 중 작업 수
+
+class ClusterNode:
+    """여러 노드가 같은 공유 유입 폴더를 감시할 때 파일을 한 번만 처리하도록 합니다 ([common] cluster = true).
+
+    실행 직전에 파일을 '<in>/.claimed/<node_id>/' 로 rename 해서 가져갑니다. rename 은
+    원자적이므로 먼저 성공한 노드만 파일을 처리합니다. 각 노드는 '<in>/.claimed/<node_id>.heartbeat'
+    파일을 주기적으로 갱신하며, lease_timeout 동안 갱신되지 않은 노드의 파일은 다른 노드가
+    유입 폴더로 되돌려 다시 처리합니다. 시계 차이의 영향을 받지 않도록 생존 여부는
+    공유 저장소가 기록한 자신의 heartbeat mtime 과 비교해 판단합니다.
+    """
+    def __init__(self, config, status, reclaimed):
+        self.node_id = config.get('common', 'node_id', fallback=socket.gethostname())
+        self.lease_timeout = config.getfloat('common', 'lease_timeout', fallback=DEFAULT_LEASE_TIMEOUT)
+        self.heartbeat_interval = self.lease_timeout / 3
+        self.status = status            # heartbeat 에 기록할 노드 상태를 반환하는 함수
+        self.reclaimed = reclaimed      # 되돌린 파일을 다시 제출하는 함수 (task_id, file_path)
+        self.folders = {}               # task_id -> 유입 폴더
+        num_tasks = config.getint('common', 'tasks', fallback=0)
+        for i in range(num_tasks):
+            task_id = str(i)
+            if task_id in config:
+                self.folders[task_id] = config[task_id]['in']
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ClusterHeartbeat', daemon=True)
+
+    def _claim_root(self, task_id):
+        return os.path.join(self.folders[task_id], CLAIM_DIR)
+
+    def claim_dir(self, task_id):
+        return os.path.join(self._claim_root(task_id), self.node_id)
+
+    def _heartbeat_path(self, task_id):
+        return os.path.join(self._claim_root(task_id), self.node_id + HEARTBEAT_SUFFIX)
+
+    def start(self):
+        for task_id in self.folders:
+            os.makedirs(self.claim_dir(task_id), exist_ok=True)
+        self.heartbeat()
+        self._thread.start()
+        self.logger.info(f"클러스터 모드로 시작합니다. (노드: {self.node_id}, lease {self.lease_timeout}초)")
+
+    def set_folders(self, folders):
+        """설정을 다시 읽어 바뀐 작업별 유입 폴더({task_id: 폴더})를 적용합니다."""
+        for task_id, folder in folders.items():
+            os.makedirs(os.path.join(folder, CLAIM_DIR, self.node_id), exist_ok=True)
+        # heartbeat 스레드가 순회 중인 dict 를 바꾸지 않도록 새 dict 로 교체
+        self.folders = dict(folders)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def claim(self, task_id, file_path):
+        """파일을 이 노드의 작업 폴더로 옮겨 가져갑니다. 다른 노드가 먼저 가져갔으면 None 을 반환합니다."""
+        claim_dir = self.claim_dir(task_id)
+        if os.path.dirname(file_path) == claim_dir:
+            return file_path        # 이전 실행에서 이미 가져간 파일
+        claimed_path = os.path.join(claim_dir, os.path.basename(file_path))
+        try:
+            os.rename(file_path, claimed_path)
+        except FileNotFoundError:
+            return None
+        return claimed_path
+
+    def release_own(self, task_id, busy):
+        """이전 실행에서 가져갔지만 처리하지 못한 파일을 유입 폴더로 되돌립니다. busy(file_path) 인 파일은 제외합니다."""
+        count = 0
+        try:
+            with os.scandir(self.claim_dir(task_id)) as entries:
+                for entry in entries:
+                    if entry.is_file() and not busy(entry.path) and self._restore(task_id, entry.path):
+                        count += 1
+        except FileNotFoundError:
+            pass
+        if count:
+            self.logger.info(f"[{task_id}] 이전 실행에서 가져간 파일 {count}개를 유입 폴더로 되돌렸습니다.")
+
+    def _restore(self, task_id, claimed_path):
+        destination = os.path.join(self.folders[task_id], os.path.basename(claimed_path))
+        if os.path.exists(destination):
+            self.logger.warning(f"유입 폴더에 같은 이름의 파일이 있어 되돌리지 않습니다: {claimed_path}")
+            return False
+        try:
+            os.rename(claimed_path, destination)
+        except FileNotFoundError:
+            return False    # 다른 노드가 먼저 되돌림
+        self.reclaimed(task_id, destination)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+                self.reap()
+            except Exception as e:
+                self.logger.error(f"클러스터 상태 갱신 중 오류 발생: {e}", exc_info=True)
+
+    def heartbeat(self):
+        data = dict(self.status(), node=self.node_id, host=socket.gethostname(), pid=os.getpid(), updated=time.time())
+        payload = json.dumps(data, ensure_ascii=False)
+        for task_id in self.folders:
+            path = self._heartbeat_path(task_id)
+            partial = f"{path}.partial-{os.getpid()}"
+            try:
+                with open(partial, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(partial, path)
+            except OSError as e:
+                self.logger.warning(f"heartbeat 를 기록할 수 없습니다 ({path}): {e}")
+
+    def _scan_heartbeats(self, task_id):
+        """(노드, heartbeat mtime, 기록된 상태) 목록을 반환합니다."""
+        heartbeats = []
+        try:
+            with os.scandir(self._claim_root(task_id)) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(HEARTBEAT_SUFFIX):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                        with open(entry.path, encoding='utf-8') as f:
+                            data = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    heartbeats.append((entry.name[:-len(HEARTBEAT_SUFFIX)], mtime, data))
+        except FileNotFoundError:
+            pass
+        return heartbeats
+
+    def _now(self, task_id):
+        # 공유 저장소 기준 현재 시각 (방금 갱신한 자신의 heartbeat mtime)
+        try:
+            return os.stat(self._heartbeat_path(task_id)).st_mtime
+        except OSError:
+            return time.time()
+
+    def reap(self):
+        """heartbeat 가 끊긴 노드가 가져간 파일을 유입 폴더로 되돌립니다."""
+        for task_id in self.folders:
+            now = self._now(task_id)
+            for node_id, mtime, _ in self._scan_heartbeats(task_id):
+                if node_id == self.node_id or now - mtime <= self.lease_timeout:
+                    continue
+                claim_dir = os.path.join(self._claim_root(task_id), node_id)
+                count = 0
+                try:
+                    with os.scandir(claim_dir) as entries:
+                        for entry in entries:
+                            if entry.is_file() and self._restore(task_id, entry.path):
+                                count += 1
+                except FileNotFoundError:
+                    pass
+                if count:
+                    self.logger.warning(f"[{task_id}] 응답이 없는 노드 {node_id}의 파일 {count}개를 다시 처리합니다.")
+
+    def nodes(self):
+        """모든 노드의 최근 상태를 노드별로 합쳐 반환합니다."""
+        nodes = {}
+        for task_id in self.folders:
+            now = self._now(task_id)
+            for node_id, mtime, data in self._scan_heartbeats(task_id):
+                if node_id in nodes and nodes[node_id]['updated'] >= data.get('updated', 0):
+                    continue
+                nodes[node_id] = dict(data, node=node_id, alive=now - mtime <= self.lease_timeout,
+                                      self=node_id == self.node_id)
+        return sorted(nodes.values(), key=lambda node: node['node'])
@@ -1,13 +1,29 @@
-# 요구사항: FR-0001, FR-0002, FR-0004
+# 요구사항: FR-0001, FR-0002, FR-0004, CR-0005
 import configparser
 import os
 from pathlib import Path
 import logging
+from .admission import parse_size
 
 # 실행 스크립트의 위치를 기준으로 프로젝트 루트 경로 계산
 # __main__.py -> folder_watcher -> dev -> project_root
 PROJECT_ROOT = Path(__file__).parent.parent.parent.resolve()
 
+# 작업 섹션에서 기본값 없이 읽는 항목
+TASK_REQUIRED_KEYS = ('name', 'in', 'done', 'stop', 'app', 'param')
+# 숫자로 읽는 항목과 해석 방법 (설정을 다시 읽을 때 적용 전에 확인)
+TASK_VALUE_KEYS = {
+    int: ('max_concurrency', 'priority', 'queue_size', 'batch_size', 'interval', 'workers', 'worker_max_jobs'),
+    float: ('weight', 'batch_timeout', 'cpu', 'cpu_limit', 'job_timeout', 'health_interval',
+            'quiet_period', 'poll_interval', 'poll_max_interval'),
+    parse_size: ('mem', 'mem_limit'),
+}
+COMMON_VALUE_KEYS = {
+    int: ('tasks', 'max_jobs', 'history_size', 'job_output_limit', 'journal_keep_rows'),
+    float: ('drain_timeout', 'lease_timeout', 'cpu_budget', 'max_load', 'journal_keep_days'),
+    parse_size: ('mem_budget', 'mem_reserve'),
+}
+
 def get_config_templates(dev_mode=False):
     """실행 모드에 따라 다른 설정 템플릿을 반환합니다."""
     if dev_mode:
@@ -20,6 +36,8 @@ tasks = 1
 credential = {test_dir / 'cred'}
 pids = {test_dir / 'pids'}
 logs = {test_dir / 'logs'}
+journal = {test_dir / 'journal.db'}
+max_jobs = 8
 
 [0]
 name = Dev Example Task
@@ -29,6 +47,9 @@ stop = {demo_dir / 'stop'}
 app = /usr/bin/python3
 param = -c "import time, sys; print(f'DEV MODE: Processing {{sys.argv[1]}}...'); time.sleep(5); print('Done.')"
 interval = 2
+max_concurrency = 4
+priority = 0
+weight = 1
 """
     else:
         # 배포 모드: 시스템 표준 경로 사용
@@ -38,6 +59,8 @@ tasks = 1
 credential = /opt/folder-watcher/cred
 pids = /var/run/folder-watcher/pids
 logs = /var/log/folder-watcher
+journal = /var/lib/folder-watcher/journal.db
+max_jobs = 64
 
 [0]
 name = Example Task
@@ -47,6 +70,9 @@ stop = /home/{os.getenv("USER", "your-username")}/folder-watcher-demo/stop
 app = /usr/bin/python3
 param = -c "import time, sys; print(f'Processing {{sys.argv[1]}}...'); time.sleep(10); print('Done.')"
 interval = 5
+max_concurrency = 8
+priority = 0
+weight = 1
 """
 
 def get_config_path() -> Path:
@@ -58,15 +84,67 @@ def create_example_config(path: Path, dev_mode=False):
     with open(path, 'w', encoding='utf-8') as f:
         f.write(config_template)
 
+def read_config(config_path) -> configparser.ConfigParser:
+    """설정 파일을 읽습니다. 파일이 없으면 FileNotFoundError, 형식이 잘못되면 configparser.Error 가 발생합니다."""
+    config = configparser.ConfigParser()
+    if not config.read(config_path, encoding='utf-8'):
+        raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {config_path}")
+    return config
+
 def load_config(dev_mode=False) -> configparser.ConfigParser:
     config_path = get_config_path()
     if not config_path.exists():
         create_example_config(config_path, dev_mode)
 
-    config = configparser.ConfigParser()
     try:
-        config.read(config_path, encoding='utf-8')
+        config = read_config(config_path)
     except configparser.Error as e:
         logging.critical(f"설정 파일 파싱 오류: {e}")
         raise
-    return config
\ No newline at end of file
+    return config
+
+def task_sections(config):
+    """[common] tasks 수만큼의 작업 섹션을 {task_id: {키: 값}} 으로 반환합니다. 값은 보간하지 않은 원문입니다."""
+    num_tasks = config.getint('common', 'tasks', fallback=0)
+    return {str(i): dict(config.items(str(i), raw=True)) for i in range(num_tasks) if str(i) in config}
+
+def diff_tasks(old, new):
+    """두 설정의 작업 섹션을 비교해 (추가, 삭제, 변경된 task_id 목록) 을 반환합니다."""
+    old_tasks, new_tasks = task_sections(old), task_sections(new)
+    added = [task_id for task_id in new_tasks if task_id not in old_tasks]
+    removed = [task_id for task_id in old_tasks if task_id not in new_tasks]
+    changed = [task_id for task_id in new_tasks if task_id in old_tasks and new_tasks[task_id] != old_tasks[task_id]]
+    return added, removed, changed
+
+def validate_config(config, task_ids):
+    """[common] 과 작업 섹션의 필수 항목, 숫자 값, 보간(%(...)s), 유입 폴더를 확인하고 오류 메시지 목록을 반환합니다."""
+    errors = _check_values(config, 'common', COMMON_VALUE_KEYS)
+    for task_id in task_ids:
+        missing = [key for key in TASK_REQUIRED_KEYS if not config.has_option(task_id, key)]
+        if missing:
+            errors.append(f"[{task_id}] 필수 항목 누락: {', '.join(missing)}")
+        errors.extend(_check_values(config, task_id, TASK_VALUE_KEYS))
+        # inotify 감시는 없는 폴더에 걸 수 없으므로 적용 전에 확인 (폴링은 폴더가 생길 때까지 다시 확인)
+        try:
+            folder = config.get(task_id, 'in', fallback=None)
+            backend = config.get(task_id, 'backend', fallback='inotify')
+        except configparser.Error:
+            continue
+        if folder is not None and backend != 'poll' and not os.path.isdir(folder):
+            errors.append(f"[{task_id}] 유입 폴더를 찾을 수 없습니다: '{folder}'")
+    return errors
+
+def _check_values(config, section, value_keys):
+    try:
+        values = dict(config.items(section))
+    except configparser.Error as e:
+        return [f"[{section}] {e}"]
+    errors = []
+    for parse, keys in value_keys.items():
+        for key in keys:
+            if key in values:
+                try:
+                    parse(values[key])
+                except ValueError:
+                    errors.append(f"[{section}] {key} 값이 올바르지 않습니다: '{values[key]}'")
+    return errors
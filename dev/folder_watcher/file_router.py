@@ -0,0 +1,96 @@
+# 요구사항: FR-0009, FR-0010, FR-0011
+import errno
+import fcntl
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+FICLONE = 0x40049409            # linux/fs.h: ioctl(dest_fd, FICLONE, src_fd)
+COPY_CHUNK = 64 * 1024 * 1024
+MOVE_WORKERS = 4
+
+def move_file(src, dst):
+    """파일을 dst 로 옮기고 옮긴 파일의 바이트 수를 반환합니다.
+
+    같은 파일 시스템에서는 os.rename 으로 원자적으로 옮깁니다. 다른 파일 시스템이면
+    대상 폴더의 숨김 임시 파일로 복사(reflink → copy_file_range → sendfile 순)한 뒤
+    rename 하므로, 대상 폴더에는 완성된 파일만 나타납니다.
+    """
+    size = os.stat(src).st_size
+    try:
+        os.rename(src, dst)
+        return size
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    directory, name = os.path.split(dst)
+    partial = os.path.join(directory, f".{name}.partial-{os.getpid()}")
+    try:
+        with open(src, 'rb') as fsrc, open(partial, 'wb') as fdst:
+            copied = _copy_fd(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size)
+            os.fsync(fdst.fileno())
+        shutil.copystat(src, partial)
+        os.rename(partial, dst)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+    os.unlink(src)
+    return copied
+
+def _copy_fd(src_fd, dst_fd, size):
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return size
+    except OSError:
+        pass    # reflink 를 지원하지 않는 파일 시스템
+
+    copied = 0
+    for copy in _kernel_copies():
+        try:
+            while copied < size:
+                sent = copy(src_fd, dst_fd, copied, min(COPY_CHUNK, size - copied))
+                if sent == 0:
+                    break
+                copied += sent
+            return copied
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+
+    # 커널 내 복사를 쓸 수 없으면 남은 부분을 일반 복사로 처리
+    os.lseek(src_fd, copied, os.SEEK_SET)
+    os.lseek(dst_fd, copied, os.SEEK_SET)
+    while chunk := os.read(src_fd, 1024 * 1024):
+        os.write(dst_fd, chunk)
+        copied += len(chunk)
+    return copied
+
+def _kernel_copies():
+    if hasattr(os, 'copy_file_range'):
+        yield _copy_file_range
+    if hasattr(os, 'sendfile'):
+        yield _sendfile
+
+def _copy_file_range(src_fd, dst_fd, offset, count):
+    return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+
+def _sendfile(src_fd, dst_fd, offset, count):
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+class FileRouter:
+    """파일 이동 전용 스레드 풀입니다. 큰 파일 복사가 다른 작업을 막지 않도록 분리합니다."""
+    def __init__(self, max_workers=MOVE_WORKERS):
+        self.max_workers = max_workers
+        self.active = 0         # 실행 중이거나 대기 중인 이동 수 (이벤트 루프 스레드에서만 갱신)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='FileRouter')
+
+    async def move(self, loop, src, dst):
+        self.active += 1
+        try:
+            return await loop.run_in_executor(self.executor, move_file, src, dst)
+        finally:
+            self.active -= 1
@@ -0,0 +1,123 @@
+# 요구사항: FR-0013, FR-0014
+import bisect
+import collections
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_HISTORY_SIZE = 10000
+
+class HistoryIndex:
+    """작업별로 완료(done)/중단(stop) 폴더에 들어온 파일을 시간순으로 색인합니다.
+
+    TaskManager 가 파일을 옮길 때 기록하므로 조회할 때 폴더를 다시 읽지 않습니다.
+    작업마다 최근 max_entries 개만 메모리에 유지합니다.
+    """
+    def __init__(self, max_entries=DEFAULT_HISTORY_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._entries = collections.defaultdict(list)     # (task_id, status) -> [(ts, seq, file_name)] 오래된 순
+        self._latest = collections.defaultdict(dict)      # (task_id, status) -> {file_name: seq}
+
+    def load(self, config, task_ids=None):
+        """시작 시 각 작업의 done/stop 폴더를 한 번 읽어 색인을 만듭니다. task_ids 를 주면 해당 작업만 읽습니다."""
+        num_tasks = config.getint('common', 'tasks', fallback=0)
+        for i in range(num_tasks):
+            task_id = str(i)
+            if task_id in config and (task_ids is None or task_id in task_ids):
+                self.load_task(task_id, config[task_id])
+
+    def load_task(self, task_id, task_config):
+        for folder_key, status in (('done', DONE), ('stop', FAILED)):
+            folder = task_config[folder_key]
+            try:
+                with os.scandir(folder) as entries:
+                    # rename 으로 들어온 파일은 ctime 이 이동 시각으로 갱신됨
+                    found = heapq.nlargest(self.max_entries, (
+                        (entry.stat().st_ctime, entry.name) for entry in entries
+                        if not entry.name.startswith('.') and entry.is_file()
+                    ))
+            except FileNotFoundError:
+                logging.warning(f"이력 색인을 만들 폴더를 찾을 수 없습니다: '{folder}'")
+                continue
+            key = (task_id, status)
+            with self._lock:
+                latest = self._latest[key]
+                for ts, file_name in reversed(found):
+                    if file_name not in latest:
+                        self._insert(key, ts, file_name)
+                self._trim(key)
+
+    def record(self, task_id, file_name, status, ts=None):
+        key = (task_id, status)
+        with self._lock:
+            self._insert(key, ts or time.time(), file_name)
+            self._trim(key)
+
+    def forget(self, task_id):
+        """설정에서 삭제되었거나 폴더가 바뀐 작업의 이력을 지웁니다."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == task_id]:
+                del self._entries[key]
+                self._latest.pop(key, None)
+
+    def remove(self, task_id, file_name, status):
+        with self._lock:
+            self._latest[(task_id, status)].pop(file_name, None)
+
+    def _insert(self, key, ts, file_name):
+        entries = self._entries[key]
+        entry = (ts, next(self._seq), file_name)
+        if not entries or ts >= entries[-1][0]:
+            entries.append(entry)
+        else:
+            bisect.insort(entries, entry)
+        self._latest[key][file_name] = entry[1]
+
+    def _trim(self, key):
+        # 갱신/삭제로 무효가 된 항목은 조회 시 건너뛰고, 목록이 커지면 한꺼번에 정리
+        entries = self._entries[key]
+        if len(entries) <= self.max_entries * 5 // 4:
+            return
+        latest = self._latest[key]
+        live = [e for e in entries if latest.get(e[2]) == e[1]][-self.max_entries:]
+        self._entries[key] = live
+        self._latest[key] = {e[2]: e[1] for e in live}
+
+    def _iter_newest(self, key):
+        latest = self._latest[key]
+        task_id, status = key
+        for ts, seq, file_name in reversed(self._entries[key]):
+            if latest.get(file_name) == seq:
+                yield ts, task_id, file_name, status
+
+    def recent(self, task_id, status, count):
+        """작업의 특정 상태 이력을 최신순으로 count 개 반환합니다."""
+        with self._lock:
+            return list(itertools.islice(self._iter_newest((task_id, status)), count))
+
+    def query(self, task_id=None, status=None, search=None, offset=0, limit=50):
+        """최신순으로 이력을 조회합니다. (전체 건수, [(ts, task_id, file_name, status)]) 를 반환합니다."""
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (task_id is None or key[0] == task_id) and (status is None or key[1] == status)]
+            merged = heapq.merge(*(self._iter_newest(key) for key in keys), key=lambda item: item[0], reverse=True)
+
+            if not search:
+                total = sum(len(self._latest[key]) for key in keys)
+                return total, list(itertools.islice(merged, offset, offset + limit))
+
+            items, total = [], 0
+            for item in merged:
+                if search in item[2]:
+                    if offset <= total < offset + limit:
+                        items.append(item)
+                    total += 1
+            return total, items
@@ -0,0 +1,167 @@
+# 요구사항: FR-0013, FR-0016
+import asyncio
+import collections
+import logging
+import os
+import threading
+
+READ_CHUNK = 64 * 1024
+RING_LINES = 500                    # 실행별로 메모리에 보관할 최근 줄 수
+MAX_LINE = 2048                     # 메모리에 보관할 한 줄의 최대 길이(바이트)
+DEFAULT_SPILL_LIMIT = 16 * 1024 * 1024
+KEEP_FINISHED = 50                  # 종료 후에도 메모리에 보관할 실행 수
+MAX_SPILL_FILES = 1000
+FOLLOW_INTERVAL = 0.2               # 초, 실행 중 spill 파일에 새로 쓰인 출력을 확인하는 주기
+FOLLOW_WINDOW = RING_LINES * MAX_LINE   # 한 번에 이보다 많이 밀렸으면 앞부분은 건너뛰고 최근 출력만 읽음
+SPILL_NOTE = "\n... (spill_limit 초과로 이후 출력은 기록하지 않습니다)\n"
+
+class JobOutput:
+    """실행 하나의 stdout/stderr 입니다.
+
+    app 은 출력을 spill 파일에 직접 씁니다. stderr 은 stdout 과 합쳐져 구분되지 않으며, spill_limit 를
+    넘은 출력은 app 을 감싼 셸이 버리고 SPILL_NOTE 를 남깁니다(STATUS_SHIM). 서비스가 종료되어도
+    출력이 끊기지 않으므로 다음 실행에서 넘겨받은 작업도 그대로 계속 실행됩니다. 서비스는 파일을
+    따라 읽어 최근 RING_LINES 줄만 메모리에 보관합니다.
+    """
+    def __init__(self, path, spill_limit, resume=False):
+        self.path = path
+        self.spill_limit = spill_limit
+        self.lines = collections.deque(maxlen=RING_LINES)
+        self.seq = 0                # 지금까지 추가된 줄 수
+        self.closed = False
+        self.truncated = False
+        self._lock = threading.Lock()
+        self._pending = b''
+        if not resume:
+            open(path, 'wb').close()
+        self._file = open(path, 'rb')
+        self._skip_partial = False
+        if resume:
+            # 이전 실행에서 시작된 작업은 최근 출력부터 이어서 읽음
+            self._seek_recent()
+
+    def _seek_recent(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size - self._file.tell() > FOLLOW_WINDOW:
+            self._file.seek(size - FOLLOW_WINDOW)
+            self._pending = b''
+            self._skip_partial = True
+
+    def append(self, line):
+        """완성된 줄 하나(개행 제외, bytes)를 추가합니다."""
+        text = line[:MAX_LINE].decode('utf-8', 'replace')
+        with self._lock:
+            self.seq += 1
+            self.lines.append((self.seq, text))
+
+    def follow(self):
+        """spill 파일에 새로 쓰인 출력을 줄 단위로 추가합니다. 이벤트 루프 스레드에서 호출됩니다."""
+        self._seek_recent()
+        while chunk := self._file.read(READ_CHUNK):
+            lines = (self._pending + chunk).split(b'\n')
+            self._pending = lines.pop()
+            if self._skip_partial and lines:
+                # 건너뛴 위치에서 시작한 첫 줄은 앞부분이 잘려 있음
+                lines.pop(0)
+                self._skip_partial = False
+            if len(self._pending) > READ_CHUNK:
+                # 개행 없이 계속 쓰는 출력도 메모리를 무한히 쓰지 않도록 잘라서 처리
+                lines.append(self._pending)
+                self._pending = b''
+            for line in lines:
+                self.append(line.rstrip(b'\r'))
+
+    def close(self):
+        """남은 출력을 읽고 닫습니다. spill_limit 를 넘어 잘렸으면 truncated 가 True 가 됩니다."""
+        try:
+            self.follow()
+            if self._pending:
+                self.append(self._pending.rstrip(b'\r'))
+                self._pending = b''
+            self.truncated = os.path.getsize(self.path) > self.spill_limit
+        except OSError as e:
+            logging.warning(f"작업 출력을 정리할 수 없습니다 ({self.path}): {e}")
+        finally:
+            self._file.close()
+            with self._lock:
+                self.closed = True
+
+    def since(self, seq):
+        """seq 이후에 추가된 줄을 반환합니다. (줄 목록, 마지막 seq, 종료 여부)
+
+        메모리에서 이미 밀려난 줄은 건너뜁니다 (전체 출력은 spill 파일에 있음).
+        """
+        with self._lock:
+            lines = [line for line in self.lines if line[0] > seq]
+            return lines, self.seq, self.closed
+
+
+class OutputStore:
+    """실행별 출력을 만들고 job_id 로 찾습니다. 메모리와 spill 파일 수는 모두 제한됩니다."""
+    def __init__(self, directory, prefix, spill_limit=DEFAULT_SPILL_LIMIT):
+        self.directory = directory
+        self.prefix = prefix
+        self.spill_limit = spill_limit
+        self._lock = threading.Lock()
+        self._outputs = collections.OrderedDict()   # job_id -> JobOutput (실행 중 + 최근 종료)
+        self._paths = collections.OrderedDict()     # job_id -> spill 파일 경로
+        os.makedirs(directory, exist_ok=True)
+        self._prune_previous()
+
+    def _prune_previous(self):
+        try:
+            with os.scandir(self.directory) as entries:
+                files = sorted((entry.stat().st_mtime, entry.path) for entry in entries if entry.is_file())
+        except OSError as e:
+            logging.warning(f"작업 출력 폴더를 정리할 수 없습니다: {e}")
+            return
+        for _, path in files[:max(0, len(files) - MAX_SPILL_FILES)]:
+            os.remove(path)
+
+    def path(self, task_id, job_id, run_id=None):
+        """실행의 spill 파일 경로입니다. run_id 를 지정하면 이전 실행(서비스 실행)의 경로를 반환합니다."""
+        return os.path.join(self.directory, f"{self.prefix if run_id is None else run_id}-{task_id}-{job_id}.log")
+
+    def create(self, jobs):
+        """묶음 실행의 작업들이 함께 쓸 출력을 만듭니다."""
+        return self._register(jobs, JobOutput(self.path(jobs[0].task_id, jobs[0].job_id), self.spill_limit))
+
+    def resume(self, jobs, path):
+        """이전 실행에서 시작되어 넘겨받은 작업의 spill 파일을 이어서 읽습니다."""
+        return self._register(jobs, JobOutput(path, self.spill_limit, resume=True))
+
+    def _register(self, jobs, output):
+        with self._lock:
+            for job in jobs:
+                self._outputs[job.job_id] = output
+                self._paths[job.job_id] = output.path
+            expired = []
+            while len(self._paths) > MAX_SPILL_FILES:
+                expired.append(self._paths.popitem(last=False)[1])
+        for old_path in set(expired) - set(self._paths.values()):
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        return output
+
+    def finish(self, output):
+        output.close()
+        with self._lock:
+            finished = [job_id for job_id, item in self._outputs.items() if item.closed]
+            for job_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+                del self._outputs[job_id]
+
+    def get(self, job_id):
+        """(메모리에 남아 있는 출력 또는 None, spill 파일 경로 또는 None) 을 반환합니다."""
+        with self._lock:
+            return self._outputs.get(job_id), self._paths.get(job_id)
+
+    async def capture(self, output, exited):
+        """exited 가 끝날 때까지 spill 파일을 FOLLOW_INTERVAL 마다 따라 읽고 exited 의 결과를 반환합니다."""
+        exited = asyncio.ensure_future(exited)
+        try:
+            while not exited.done():
+                output.follow()
+                await asyncio.wait([exited], timeout=FOLLOW_INTERVAL)
+            return exited.result()
+        finally:
+            exited.cancel()
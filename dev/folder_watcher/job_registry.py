@@ -0,0 +1,139 @@
+# 요구사항: FR-0013, FR-0014
+import collections
+import itertools
+import os
+import queue
+import threading
+import time
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+RECENT_JOBS = 200
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+class Job:
+    """작업 하나의 상태를 나타냅니다."""
+    __slots__ = ('job_id', 'task_id', 'file_path', 'file_name', 'state', 'detected_at',
+                 'queued_at', 'started_at', 'finished_at', 'pid', 'exit_code')
+
+    def __init__(self, job_id, task_id, file_path, detected_at=None):
+        self.job_id = job_id
+        self.task_id = task_id
+        self.file_path = file_path
+        self.file_name = os.path.basename(file_path)
+        self.state = QUEUED
+        self.queued_at = time.time()
+        self.detected_at = detected_at or self.queued_at
+        self.started_at = None
+        self.finished_at = None
+        self.pid = None
+        self.exit_code = None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class JobRegistry:
+    """대기, 실행, 종료된 작업을 메모리에 보관하는 스레드 안전한 저장소입니다."""
+    def __init__(self, recent_size=RECENT_JOBS):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queued = collections.defaultdict(dict)    # task_id -> {job_id: Job} (삽입 순서 유지)
+        self._running = {}                              # job_id -> Job
+        self._by_pid = {}                               # pid -> Job
+        self._recent = collections.deque(maxlen=recent_size)
+        self._subscribers = []
+
+    def subscribe(self):
+        """상태 변경 알림을 받을 큐를 등록합니다. 큐가 가득 차면 구독이 해제됩니다."""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def is_subscribed(self, subscriber):
+        with self._lock:
+            return subscriber in self._subscribers
+
+    def _publish(self, event_type, job):
+        if not self._subscribers:
+            return
+        event = (event_type, job.to_dict())
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # 따라오지 못하는 구독자는 해제하고, 재접속 시 전체 상태를 다시 받도록 함
+                self.unsubscribe(subscriber)
+
+    def create(self, task_id, file_path, detected_at=None):
+        """등록하지 않은 새 작업을 만듭니다. 대기열에 들어간 뒤 add() 로 등록합니다."""
+        return Job(next(self._ids), task_id, file_path, detected_at)
+
+    def add(self, job):
+        with self._lock:
+            # 등록 전에 이미 실행이 시작되었을 수 있음
+            if job.state == QUEUED:
+                self._queued[job.task_id][job.job_id] = job
+        self._publish('update', job)
+
+    def mark_running(self, job, pid):
+        with self._lock:
+            self._queued[job.task_id].pop(job.job_id, None)
+            job.state = RUNNING
+            job.started_at = time.time()
+            job.pid = pid
+            self._running[job.job_id] = job
+            self._by_pid[pid] = job
+        self._publish('update', job)
+
+    def mark_finished(self, job, exit_code):
+        with self._lock:
+            self._queued[job.task_id].pop(job.job_id, None)
+            self._running.pop(job.job_id, None)
+            if job.pid is not None:
+                self._by_pid.pop(job.pid, None)
+            job.state = DONE if exit_code == 0 else FAILED
+            job.exit_code = exit_code
+            job.finished_at = time.time()
+            self._recent.append(job)
+        self._publish('update', job)
+
+    def discard(self, job):
+        """실행하지 않고 건너뛴 작업을 목록에서 제거합니다."""
+        with self._lock:
+            self._queued[job.task_id].pop(job.job_id, None)
+        self._publish('remove', job)
+
+    def find_pid(self, pid):
+        with self._lock:
+            return self._by_pid.get(pid)
+
+    def running(self):
+        with self._lock:
+            return list(self._running.values())
+
+    def queued(self, limit_per_task=None):
+        with self._lock:
+            jobs = []
+            for task_jobs in self._queued.values():
+                jobs.extend(itertools.islice(task_jobs.values(), limit_per_task))
+            return jobs
+
+    def queued_count(self, task_id):
+        with self._lock:
+            return len(self._queued[task_id])
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
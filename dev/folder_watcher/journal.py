@@ -0,0 +1,192 @@
+# 요구사항: FR-0006, FR-0016
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.05   # 초
+DEFAULT_KEEP_DAYS = 30
+DEFAULT_KEEP_ROWS = 1000000
+PRUNE_INTERVAL = 3600   # 초, 오래된 기록을 정리하는 주기
+PRUNE_CHUNK = 10000     # 한 트랜잭션에서 지우는 행 수
+
+# 이전 실행에서 끝나지 않은 작업의 상태
+UNFINISHED_STATES = ('queued', 'running', 'finished')
+# 처리가 끝나 복구에 쓰지 않는 상태 (보관 기간이 지나면 정리)
+FINAL_STATES = ('moved', 'skipped', 'requeued', 'lost', 'adopted')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id       INTEGER NOT NULL,
+    job_id       INTEGER NOT NULL,
+    task_id      TEXT NOT NULL,
+    file_path    TEXT NOT NULL,
+    state        TEXT NOT NULL,
+    detected_at  REAL,
+    queued_at    REAL,
+    started_at   REAL,
+    finished_at  REAL,
+    moved_at     REAL,
+    pid          INTEGER,
+    exit_code    INTEGER,
+    run_seconds  REAL,
+    move_seconds REAL,
+    destination  TEXT,
+    PRIMARY KEY (run_id, job_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE INDEX IF NOT EXISTS jobs_queued ON jobs (queued_at);
+"""
+
+class JobJournal:
+    """작업 상태 변화를 SQLite(WAL) 파일에 기록합니다.
+
+    기록 요청은 큐에 넣기만 하고, 별도 스레드가 모아서 한 트랜잭션으로 씁니다.
+    처리가 끝난 기록은 keep_days 일이 지나거나 전체가 keep_rows 행을 넘으면 한가할 때 지웁니다 (0 이면 제한 없음).
+    """
+    def __init__(self, path, keep_days=DEFAULT_KEEP_DAYS, keep_rows=DEFAULT_KEEP_ROWS):
+        self.path = path
+        self.run_id = time.time_ns()
+        self.keep_days = keep_days
+        self.keep_rows = keep_rows
+        self._queue = queue.Queue()
+        self._closed = False
+        self._next_prune = 0.0
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+        self._writer = threading.Thread(target=self._write_loop, name='JournalWriter', daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                with conn:
+                    for statement in batch:
+                        if statement is not None:
+                            conn.execute(*statement)
+            except sqlite3.Error as e:
+                logging.error(f"작업 기록(journal) 쓰기 실패: {e}")
+            if stop:
+                conn.close()
+                return
+            if self._queue.empty() and time.monotonic() >= self._next_prune:
+                self._prune(conn)
+
+    def _prune(self, conn):
+        """보관 기간이 지났거나 keep_rows 를 넘은 처리가 끝난 기록을 오래된 것부터 지웁니다."""
+        self._next_prune = time.monotonic() + PRUNE_INTERVAL
+        final = f"state IN ({', '.join('?' * len(FINAL_STATES))})"
+        deleted = 0
+        try:
+            if self.keep_days > 0:
+                cutoff = time.time() - self.keep_days * 86400
+                deleted += self._delete_oldest(conn, f"{final} AND queued_at < ?", (*FINAL_STATES, cutoff))
+            if self.keep_rows > 0:
+                excess = conn.execute("SELECT count(*) FROM jobs").fetchone()[0] - self.keep_rows
+                if excess > 0:
+                    deleted += self._delete_oldest(conn, final, FINAL_STATES, excess)
+        except sqlite3.Error as e:
+            logging.error(f"작업 기록(journal) 정리 실패: {e}")
+        if deleted:
+            logging.info(f"오래된 작업 기록 {deleted}건을 정리했습니다.")
+
+    def _delete_oldest(self, conn, condition, params, limit=None):
+        """condition 에 맞는 행을 오래된 것부터 최대 limit 개 지웁니다.
+
+        새 기록 요청이 들어오면 쓰기를 오래 막지 않도록 멈추고, 다음에 한가할 때 이어서 지웁니다.
+        """
+        deleted = 0
+        while limit is None or deleted < limit:
+            chunk = PRUNE_CHUNK if limit is None else min(PRUNE_CHUNK, limit - deleted)
+            with conn:
+                count = conn.execute(
+                    f"DELETE FROM jobs WHERE rowid IN (SELECT rowid FROM jobs WHERE {condition} ORDER BY queued_at LIMIT ?)",
+                    (*params, chunk)).rowcount
+            deleted += count
+            if count < chunk:
+                break
+            if not self._queue.empty():
+                self._next_prune = 0.0
+                break
+        return deleted
+
+    def _submit(self, sql, params):
+        if not self._closed:
+            self._queue.put((sql, params))
+
+    def close(self):
+        """남은 기록을 모두 쓰고 기록 스레드를 종료합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    def queued(self, job):
+        self._submit(
+            "INSERT OR REPLACE INTO jobs (run_id, job_id, task_id, file_path, state, detected_at, queued_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+            (self.run_id, job.job_id, job.task_id, job.file_path, job.detected_at, job.queued_at))
+
+    def started(self, job):
+        # 클러스터 모드에서는 실행 직전에 파일을 작업 폴더로 가져가므로, 복구할 때 찾도록 실제 경로를 기록
+        self._submit(
+            "UPDATE jobs SET state = 'running', started_at = ?, pid = ?, file_path = ? WHERE run_id = ? AND job_id = ?",
+            (job.started_at, job.pid, job.file_path, self.run_id, job.job_id))
+
+    def finished(self, job, exit_code, finished_at):
+        run_seconds = finished_at - job.started_at if job.started_at else None
+        self._submit(
+            "UPDATE jobs SET state = 'finished', finished_at = ?, exit_code = ?, run_seconds = ? "
+            "WHERE run_id = ? AND job_id = ?",
+            (finished_at, exit_code, run_seconds, self.run_id, job.job_id))
+
+    def moved(self, job, destination, move_seconds):
+        self._submit(
+            "UPDATE jobs SET state = 'moved', moved_at = ?, destination = ?, move_seconds = ? "
+            "WHERE run_id = ? AND job_id = ?",
+            (time.time(), destination, move_seconds, self.run_id, job.job_id))
+
+    def skipped(self, job):
+        self._submit(
+            "UPDATE jobs SET state = 'skipped' WHERE run_id = ? AND job_id = ?",
+            (self.run_id, job.job_id))
+
+    def resolve(self, run_id, job_id, state):
+        """이전 실행에서 끝나지 않은 작업을 복구 결과 상태로 닫습니다."""
+        self._submit("UPDATE jobs SET state = ? WHERE run_id = ? AND job_id = ?", (state, run_id, job_id))
+
+    def unfinished(self):
+        """이전 실행에서 끝나지 않은 작업을 대기열에 들어온 순서대로 반환합니다."""
+        placeholders = ', '.join('?' * len(UNFINISHED_STATES))
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(
+                f"SELECT * FROM jobs WHERE state IN ({placeholders}) AND run_id != ? ORDER BY queued_at",
+                (*UNFINISHED_STATES, self.run_id)).fetchall()
+        finally:
+            conn.close()
@@ -0,0 +1,200 @@
+# 요구사항: FR-0016, FR-0017
+import array
+import bisect
+import mmap
+import os
+import re
+import threading
+
+TAIL_BLOCK = 64 * 1024
+INDEX_CHUNK = 4 * 1024 * 1024
+MAX_INDEXES = 32
+
+LEVELS = {'DEBUG': 1, 'INFO': 2, 'WARNING': 3, 'ERROR': 4, 'CRITICAL': 5}
+# logger.py 의 형식: '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+RECORD_PATTERN = re.compile(rb'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d+ - \S+ - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (.*)')
+# 작업 로그는 "[작업 이름] ..." 또는 "... (작업: 작업 이름)" 형식
+TASK_PATTERN = re.compile(r'^\[([^\]]+)\]|\(작업: ([^)]+)\)'.encode('utf-8'))
+
+def tail_lines(path, count):
+    """파일 끝에서부터 거꾸로 읽어 마지막 count 줄을 반환합니다. 파일 크기와 관계없이 필요한 부분만 읽습니다."""
+    blocks = []
+    newlines = 0
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        while position > 0 and newlines <= count:
+            size = min(TAIL_BLOCK, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            newlines += block.count(b'\n')
+            blocks.append(block)
+    lines = b''.join(reversed(blocks)).splitlines()
+    return [line.decode('utf-8', 'replace') for line in lines[-count:]] if count else []
+
+def parse_record(line):
+    """로그 한 줄의 (레벨 번호, 작업 이름) 을 반환합니다. 레코드의 첫 줄이 아니면 None 을 반환합니다."""
+    match = RECORD_PATTERN.match(line)
+    if match is None:
+        return None
+    task = TASK_PATTERN.search(match[2])
+    return LEVELS[match[1].decode()], (task[1] or task[2]) if task else None
+
+
+class LogIndex:
+    """로그 파일 하나의 줄 시작 위치와 레벨/작업 이름을 배열로 보관하는 색인입니다.
+
+    처음 한 번 파일 전체를 읽고, 이후에는 늘어난 부분만 읽어 색인에 더합니다.
+    파일이 바뀌면(inode 변경, 크기 감소) 처음부터 다시 만듭니다. 검색 시 줄 내용은
+    mmap 으로 필요한 줄만 읽습니다. 여러 줄로 된 메시지(예외 추적)는 앞 레코드의
+    레벨과 작업 이름을 따릅니다.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, inode):
+        self.inode = inode
+        self.size = 0                       # 색인한 위치 (완성된 마지막 줄의 끝)
+        self.offsets = array.array('Q')     # 줄 시작 위치
+        self.levels = bytearray()           # 레벨 번호 (0: 알 수 없음)
+        self.tasks = array.array('H')       # 작업 이름 번호 (0: 없음)
+        self.task_names = [None]
+        self._task_codes = {}
+        self._record = (0, 0)               # 여러 줄 메시지에 적용할 이전 레코드의 (레벨, 작업)
+
+    def update(self):
+        with self._lock:
+            self._update()
+
+    def _update(self):
+        st = os.stat(self.path)
+        if st.st_ino != self.inode or st.st_size < self.size:
+            self._reset(st.st_ino)
+        if st.st_size == self.size:
+            return
+        position = self.size
+        with open(self.path, 'rb') as f:
+            f.seek(position)
+            pending = b''
+            while chunk := f.read(INDEX_CHUNK):
+                data = pending + chunk
+                start = 0
+                while (newline := data.find(b'\n', start)) >= 0:
+                    self._add(position + start, data[start:newline])
+                    start = newline + 1
+                position += start
+                pending = data[start:]
+        # 아직 쓰는 중인 마지막 줄은 다음 갱신 때 색인
+        self.size = position
+
+    def _add(self, offset, line):
+        record = parse_record(line)
+        if record is not None:
+            level, task = record
+            code = 0
+            if task is not None:
+                code = self._task_codes.get(task)
+                if code is None:
+                    code = self._task_codes[task] = len(self.task_names)
+                    self.task_names.append(task)
+            self._record = (level, code)
+        self.offsets.append(offset)
+        self.levels.append(self._record[0])
+        self.tasks.append(self._record[1])
+
+    def query(self, min_level=0, task=None, text=None, before=None, limit=200):
+        """조건에 맞는 줄을 최신 줄부터 찾아 limit 개까지 반환합니다.
+
+        (시간순 줄 목록, 다음 페이지 요청에 쓸 before 값 또는 None) 을 반환합니다.
+        before 는 줄 번호이며, 그보다 앞선 줄만 찾습니다.
+        """
+        with self._lock:
+            self._update()
+            task_code = 0
+            if task:
+                task_code = self._task_codes.get(task.encode('utf-8'))
+                if task_code is None:
+                    return [], None
+            if self.size == 0:
+                return [], None
+            needle = text.encode('utf-8') if text else None
+            count = len(self.offsets)
+            index = (count if before is None else min(before, count)) - 1
+            found = []
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), self.size, access=mmap.ACCESS_READ) as data:
+                while index >= 0 and len(found) < limit:
+                    if needle is not None:
+                        # 검색어가 있으면 줄 단위로 비교하지 않고 mmap 에서 바로 찾은 뒤 줄 번호로 변환
+                        end = self.offsets[index + 1] if index + 1 < count else self.size
+                        position = data.rfind(needle, 0, end)
+                        if position < 0:
+                            index = -1
+                            break
+                        index = bisect.bisect_right(self.offsets, position, 0, index + 1) - 1
+                    if self.levels[index] >= min_level and (not task_code or self.tasks[index] == task_code):
+                        end = self.offsets[index + 1] - 1 if index + 1 < count else self.size - 1
+                        line = data[self.offsets[index]:end]
+                        if needle is None or needle in line:
+                            found.append(line.decode('utf-8', 'replace'))
+                    index -= 1
+            found.reverse()
+            return found, (index + 1 if index >= 0 else None)
+
+
+class LogFollower:
+    """파일에 새로 추가되는 줄을 읽습니다. 파일이 교체(로그 회전)되면 새 파일을 처음부터 읽습니다."""
+    def __init__(self, path, min_level=0, task=None, text=None):
+        self.path = path
+        self.min_level = min_level
+        self.task = task.encode('utf-8') if task else None
+        self.text = text.encode('utf-8') if text else None
+        st = os.stat(path)
+        self.inode = st.st_ino
+        self.position = st.st_size
+        self._record = (0, None)
+
+    def poll(self):
+        """새로 완성된 줄 중 조건에 맞는 줄 목록을 반환합니다."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if st.st_ino != self.inode or st.st_size < self.position:
+            self.inode, self.position = st.st_ino, 0
+        if st.st_size == self.position:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.position)
+            data = f.read(st.st_size - self.position)
+        end = data.rfind(b'\n')
+        if end < 0:
+            return []
+        self.position += end + 1
+        lines = []
+        for line in data[:end].split(b'\n'):
+            record = parse_record(line)
+            if record is not None:
+                self._record = record
+            level, task = self._record
+            if level < self.min_level or (self.task and task != self.task):
+                continue
+            if self.text and self.text not in line:
+                continue
+            lines.append(line.decode('utf-8', 'replace'))
+        return lines
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_index(path):
+    """파일별 색인을 반환합니다. 색인은 프로세스 안에서 재사용됩니다."""
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            if len(_indexes) >= MAX_INDEXES:
+                _indexes.pop(next(iter(_indexes)))
+            index = _indexes[path] = LogIndex(path)
+        return index
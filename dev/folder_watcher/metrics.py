@@ -0,0 +1,120 @@
+# 요구사항: FR-0013, FR-0016
+import bisect
+import threading
+
+# 초 단위. 파일 감지부터 이동까지 수 ms ~ 수십 분 범위를 다룸
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """증가만 하는 값입니다. labels 값의 튜플별로 따로 셉니다."""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, labels, (), value
+
+
+class Histogram:
+    """값의 분포를 고정된 구간(bucket)별 개수로 기록합니다."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._values = {}       # labels -> [구간별 개수..., 합계]
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(counts) for labels, counts in self._values.items()}
+        for labels, counts in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield self.name + '_bucket', labels, (('le', _format_value(float(bound))),), cumulative
+            total = cumulative + counts[len(self.buckets)]
+            yield self.name + '_bucket', labels, (('le', '+Inf'),), total
+            yield self.name + '_sum', labels, (), counts[-1]
+            yield self.name + '_count', labels, (), total
+
+
+class Gauge:
+    """수집할 때 collect() 로 값을 읽는 현재 값입니다. collect 는 {labels: 값} 을 반환합니다."""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), collect=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in sorted(self.collect().items()):
+            yield self.name, labels, (), value
+
+
+class MetricsRegistry:
+    """지표를 등록하고 Prometheus 텍스트 형식(0.0.4)으로 출력합니다.
+
+    작업 처리 중에는 Counter/Histogram 갱신(잠금 한 번)만 하고,
+    대기열 길이 같은 현재 값은 /metrics 요청 시 Gauge 로 읽습니다.
+    """
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None):
+        return self.register(Gauge(name, documentation, labelnames, collect))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, extra, value in metric.samples():
+                lines.append(f"{name}{_format_labels(metric.labelnames, labels, extra)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
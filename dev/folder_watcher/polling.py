@@ -0,0 +1,138 @@
+# 요구사항: FR-0005, FR-0006
+import logging
+import os
+import stat
+import threading
+import time
+
+DEFAULT_POLL_INTERVAL = 2.0     # 초
+DEFAULT_POLL_MAX_INTERVAL = 30.0
+BACKOFF = 1.5
+
+class PollingWatcher:
+    """inotify 이벤트가 오지 않는 네트워크 폴더(NFS/SMB)를 주기적으로 확인합니다 (backend = poll).
+
+    폴더의 mtime 이 바뀐 경우에만 목록을 다시 읽고, 목록에서는 (inode, size, mtime) 으로 이미 아는
+    파일을 걸러 새 파일만 후보로 둡니다. 지워진 파일의 inode 가 같은 이름의 새 파일에 재사용되어도
+    크기나 mtime 이 달라 새 파일로 인식됩니다. 새 파일은 크기와 mtime 이 한 주기 동안 바뀌지
+    않으면 쓰기가 끝난 것으로 보고 제출합니다 (inotify 의 'closed' 이벤트에 해당).
+    변화가 없으면 확인 주기를 max_interval 까지 늘리고, 변화가 생기면 다시 줄입니다.
+    """
+    def __init__(self, task_id, task_config, submit):
+        self.task_id = task_id
+        self.task_config = task_config
+        self.folder = task_config['in']
+        self.submit = submit
+        self.min_interval = task_config.getfloat('poll_interval', fallback=DEFAULT_POLL_INTERVAL)
+        self.max_interval = max(self.min_interval,
+                                task_config.getfloat('poll_max_interval', fallback=DEFAULT_POLL_MAX_INTERVAL))
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._index = {}            # 파일 이름 -> (inode, size, mtime_ns) (이미 제출했거나 시작 시 있던 파일)
+        self._candidates = {}       # 파일 이름 -> (inode, size, mtime_ns, 처음 발견한 시각)
+        self._dir_mtime = None
+        self._last_rescan = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"Poller-{task_id}", daemon=True)
+
+    def start(self):
+        # 시작 시 있던 파일은 WatcherService 의 기존 파일 처리에서 제출됨
+        self._dir_mtime = self._folder_mtime()
+        self._last_rescan = time.monotonic()
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    try:
+                        self._index[entry.name] = _identity(entry.stat())
+                    except FileNotFoundError:
+                        pass
+        except FileNotFoundError:
+            self.logger.error(f"감시할 폴더를 찾을 수 없습니다: '{self.folder}'")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _folder_mtime(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _run(self):
+        interval = self.min_interval
+        while not self._stop.wait(interval):
+            try:
+                changed = self.poll()
+            except Exception as e:
+                self.logger.error(f"폴더 확인 중 오류 발생 ({self.folder}): {e}", exc_info=True)
+                changed = False
+            if changed or self._candidates:
+                interval = self.min_interval
+            else:
+                interval = min(self.max_interval, interval * BACKOFF)
+
+    def poll(self):
+        """한 번 확인합니다. 폴더에 변화가 있었으면 True 를 반환합니다."""
+        dir_mtime = self._folder_mtime()
+        changed = dir_mtime != self._dir_mtime
+        # mtime 해상도가 낮은 파일 시스템에 대비해 max_interval 마다 한 번은 목록을 다시 읽음
+        if changed or time.monotonic() - self._last_rescan >= self.max_interval:
+            self._dir_mtime = dir_mtime
+            changed = self._rescan() or changed
+        self._check_candidates()
+        return changed
+
+    def _rescan(self):
+        """목록을 다시 읽습니다. 새 후보가 생겼으면 True 를 반환합니다."""
+        self._last_rescan = time.monotonic()
+        found = False
+        index = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        identity = _identity(entry.stat())
+                    except FileNotFoundError:
+                        continue
+                    index[entry.name] = identity
+                    if self._index.get(entry.name) == identity:
+                        continue
+                    inode = identity[0]
+                    candidate = self._candidates.get(entry.name)
+                    if candidate is None or candidate[0] != inode:
+                        self._candidates[entry.name] = (inode, -1, -1, time.time())
+                        found = True
+        except FileNotFoundError:
+            self.logger.error(f"감시할 폴더를 찾을 수 없습니다: '{self.folder}'")
+        # 사라진 파일은 색인과 후보에서 제거
+        self._index = {name: identity for name, identity in self._index.items() if name in index}
+        for name in [name for name in self._candidates if name not in index]:
+            del self._candidates[name]
+        return found
+
+    def _check_candidates(self):
+        for name, (inode, size, mtime_ns, first_seen) in list(self._candidates.items()):
+            path = os.path.join(self.folder, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                del self._candidates[name]
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                del self._candidates[name]
+                self._index[name] = _identity(st)
+                continue
+            if (st.st_size, st.st_mtime_ns) == (size, mtime_ns):
+                del self._candidates[name]
+                self._index[name] = _identity(st)
+                self.submit(path, first_seen)
+            else:
+                self._candidates[name] = (st.st_ino, st.st_size, st.st_mtime_ns, first_seen)
+
+
+def _identity(st):
+    return st.st_ino, st.st_size, st.st_mtime_ns
@@ -0,0 +1,137 @@
+# 요구사항: FR-0005, FR-0006
+import logging
+import os
+import threading
+import time
+
+TICK = 0.25         # 초
+SLOTS = 512
+DEFAULT_QUIET_PERIOD = 3.0
+
+class TimerWheel:
+    """해시 타이머 휠입니다. 예약/취소는 O(1) 이고, 시간이 지난 칸만 확인합니다."""
+    def __init__(self, tick=TICK, slots=SLOTS):
+        self.tick = tick
+        self._slots = [dict() for _ in range(slots)]     # 칸 -> {key: 만료 틱}
+        self._where = {}                                  # key -> 만료 틱
+        self._current = self._tick_of(time.monotonic())
+
+    def _tick_of(self, now):
+        return int(now / self.tick)
+
+    def schedule(self, key, delay):
+        self.cancel(key)
+        target = max(self._tick_of(time.monotonic() + delay), self._current + 1)
+        self._slots[target % len(self._slots)][key] = target
+        self._where[key] = target
+
+    def cancel(self, key):
+        target = self._where.pop(key, None)
+        if target is not None:
+            self._slots[target % len(self._slots)].pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def __len__(self):
+        return len(self._where)
+
+    def advance(self, now=None):
+        """지금까지 만료된 key 목록을 반환합니다."""
+        now_tick = self._tick_of(time.monotonic() if now is None else now)
+        expired = []
+        # 한 바퀴 이상 밀렸으면 모든 칸을 한 번씩만 확인
+        start = max(self._current + 1, now_tick - len(self._slots) + 1)
+        for t in range(start, now_tick + 1):
+            slot = self._slots[t % len(self._slots)]
+            for key, target in list(slot.items()):
+                if target <= now_tick:
+                    del slot[key]
+                    del self._where[key]
+                    expired.append(key)
+        self._current = max(self._current, now_tick)
+        return expired
+
+
+class ReadinessTracker:
+    """파일 쓰기가 끝났는지 판단해 한 번만 제출하는 단계입니다.
+
+    닫힘(closed), 하드링크, 폴더 안으로의 rename 처럼 완성이 확실한 이벤트는 바로 제출하고,
+    그 밖의 생성/수정 이벤트는 후보로 두었다가 크기와 mtime 이 quiet_period 동안
+    바뀌지 않으면 제출합니다. 같은 파일의 연속된 이벤트는 후보 하나로 합쳐집니다.
+    """
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._wheel = TimerWheel()
+        self._candidates = {}       # path -> [submit, quiet_period, (size, mtime_ns), 처음 감지 시각]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ReadinessTracker', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def ready(self, path, submit, detected_at):
+        """완성된 파일입니다. 대기 중인 후보가 있으면 합쳐서 즉시 제출합니다."""
+        with self._lock:
+            candidate = self._candidates.pop(path, None)
+            self._wheel.cancel(path)
+        submit(path, candidate[3] if candidate else detected_at)
+
+    def touch(self, path, submit, quiet_period, detected_at):
+        """쓰기 중일 수 있는 파일입니다. quiet_period 동안 변화가 없으면 제출합니다."""
+        signature = _signature(path)
+        with self._lock:
+            candidate = self._candidates.get(path)
+            if candidate is None:
+                self._candidates[path] = [submit, quiet_period, signature, detected_at]
+            else:
+                # 마지막 이벤트 시점의 크기와 mtime 을 기준으로 삼아야 쓰기가 끝난 뒤 quiet_period 만에 제출됨
+                candidate[2] = signature
+            self._wheel.schedule(path, quiet_period)
+
+    def discard(self, path):
+        with self._lock:
+            self._candidates.pop(path, None)
+            self._wheel.cancel(path)
+
+    def _run(self):
+        while not self._stop.wait(self._wheel.tick):
+            with self._lock:
+                expired = self._wheel.advance()
+            for path in expired:
+                # 제출(또는 설정 다시 읽기) 중 오류가 나도 다른 파일의 확인은 계속함
+                try:
+                    self._check(path)
+                except Exception as e:
+                    self.logger.error(f"파일 준비 확인 중 오류 발생 ({path}): {e}", exc_info=True)
+
+    def _check(self, path):
+        signature = _signature(path)
+        with self._lock:
+            candidate = self._candidates.get(path)
+            if candidate is None or path in self._wheel:
+                return      # 그 사이 제출되었거나 새 이벤트로 다시 예약됨
+            if signature is None:
+                del self._candidates[path]
+                return
+            if signature != candidate[2]:
+                # 이벤트 없이 내용이 바뀌는 경우(네트워크 폴더, 열린 채 쓰는 프로세스)에 대비
+                candidate[2] = signature
+                self._wheel.schedule(path, candidate[1])
+                return
+            del self._candidates[path]
+        candidate[0](path, candidate[3])
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
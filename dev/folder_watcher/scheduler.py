@@ -0,0 +1,239 @@
+# 요구사항: PR-0001, FR-0006
+import collections
+import os
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 10000
+STARVATION_TIMEOUT = 30.0   # 초, 자원이 부족해 밀린 작업이 이보다 오래 기다리면 다른 작업을 먼저 시작하지 않음
+
+class TaskQueue:
+    """작업(섹션) 하나의 대기열과 스케줄링 설정을 보관합니다."""
+    def __init__(self, task_id, max_concurrency, priority=0, weight=1.0, queue_size=DEFAULT_QUEUE_SIZE,
+                 batch_size=1, batch_timeout=0.0, cpu=0.0, mem=0):
+        self.task_id = task_id
+        self.max_concurrency = max(1, max_concurrency)
+        self.priority = priority
+        self.weight = max(weight, 0.001)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = max(0.0, batch_timeout)
+        self.cpu = max(0.0, cpu)            # 실행 하나가 쓰는 CPU 코어 수 힌트
+        self.mem = max(0, mem)              # 실행 하나가 쓰는 최대 메모리 힌트 (바이트)
+        self.blocked_since = None           # 자원이 부족해 실행하지 못하기 시작한 시각
+        self.pending = collections.deque()  # 대기 중인 Job
+        self.known = set()                  # 대기 중이거나 실행 중인 파일 이름 (중복 제출 방지)
+        self.running = 0
+        self.vtime = 0.0                    # 가중 공정 스케줄링용 가상 시간
+        self.overflowed = False
+        self.retired = False                # 설정에서 삭제되어 실행 중인 작업이 끝나기를 기다리는 대기열
+
+    def batch_deadline(self):
+        """가장 오래 기다린 파일 기준으로 묶음을 채우지 않고 실행할 시각입니다."""
+        return self.pending[0].queued_at + self.batch_timeout
+
+    def eligible(self, now):
+        if not self.pending or self.running >= self.max_concurrency:
+            return False
+        # 묶음 실행은 묶음이 다 찼거나 batch_timeout 이 지났을 때 실행
+        return len(self.pending) >= self.batch_size or self.batch_deadline() <= now
+
+
+class TaskScheduler:
+    """작업별 대기열을 우선순위와 가중치에 따라 공정하게 배분하는 스케줄러입니다.
+
+    우선순위가 높은 작업이 먼저 선택되고, 같은 우선순위 안에서는 처리한 건수를
+    가중치로 나눈 가상 시간이 가장 작은 작업이 선택됩니다(stride scheduling).
+    """
+    def __init__(self, max_jobs, admission=None):
+        self.max_jobs = max_jobs
+        self.admission = admission      # AdmissionController (없으면 max_jobs 만 확인)
+        self.deferred = False           # 마지막 pop() 이 자원 부족으로 실행을 미뤘는지 여부
+        self.queues = {}
+        self.running = 0
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+
+    def add_queue(self, task_queue):
+        with self._lock:
+            # 새로 추가된 작업이 밀린 가상 시간을 독점하지 않도록 현재 최소값에서 시작
+            active = [q.vtime for q in self.queues.values() if q.pending or q.running]
+            task_queue.vtime = min(active, default=0.0)
+            old = self.queues.get(task_queue.task_id)
+            if old is not None and old.retired:
+                # 삭제 후 다시 추가된 작업은 아직 실행 중인 이전 작업의 슬롯을 이어받음
+                task_queue.running = old.running
+                task_queue.known = old.known
+            self.queues[task_queue.task_id] = task_queue
+
+    def remove_queue(self, task_id):
+        """설정에서 삭제된 작업의 대기열을 없애고, 실행하지 않은 작업 목록을 반환합니다.
+
+        실행 중인 작업이 있으면 release() 로 모두 끝날 때까지 대기열을 남겨 둡니다.
+        """
+        with self._lock:
+            queue = self.queues[task_id]
+            dropped = list(queue.pending)
+            queue.pending.clear()
+            queue.retired = True
+            if not queue.running:
+                del self.queues[task_id]
+            self._space.notify_all()
+            return dropped
+
+    def replace_queue(self, task_queue, keep_pending=True):
+        """설정이 바뀐 작업의 대기열을 새 설정으로 바꿉니다. 실행 중인 작업 수와 가상 시간은 이어받습니다.
+
+        keep_pending 이 False 이면 대기 중인 작업을 넘기지 않고 반환합니다 (유입 폴더가 바뀐 경우).
+        """
+        with self._lock:
+            old = self.queues[task_queue.task_id]
+            task_queue.running = old.running
+            task_queue.vtime = old.vtime
+            task_queue.known = old.known
+            dropped = []
+            if keep_pending:
+                task_queue.pending = old.pending
+                task_queue.overflowed = old.overflowed
+            else:
+                dropped = list(old.pending)
+                for job in dropped:
+                    task_queue.known.discard(job.file_name)
+            self.queues[task_queue.task_id] = task_queue
+            self._space.notify_all()
+            return dropped
+
+    def resize(self, max_jobs):
+        with self._lock:
+            self.max_jobs = max_jobs
+
+    def push(self, job, block=False):
+        """작업을 대기열에 넣습니다. 중복이거나 대기열이 가득 차면 False 를 반환합니다.
+
+        block 이 True 이면 대기열이 가득 찬 동안 자리가 날 때까지 기다립니다.
+        설정에서 삭제된 작업이면 False 를 반환합니다.
+        """
+        with self._lock:
+            queue = self.queues.get(job.task_id)
+            if block:
+                while queue is not None and not queue.retired and \
+                        len(queue.pending) >= queue.queue_size and job.file_name not in queue.known:
+                    self._space.wait()
+                    queue = self.queues.get(job.task_id)
+            if queue is None or queue.retired or job.file_name in queue.known:
+                return False
+            if len(queue.pending) >= queue.queue_size:
+                queue.overflowed = True
+                return False
+            if not queue.pending and not queue.running:
+                active = [q.vtime for q in self.queues.values() if q.pending or q.running]
+                queue.vtime = max(queue.vtime, min(active, default=0.0))
+            queue.pending.append(job)
+            queue.known.add(job.file_name)
+            return True
+
+    def pop(self):
+        """다음에 한 번의 실행으로 처리할 작업 목록을 선택합니다. 실행할 작업이 없으면 None.
+
+        batch_size 가 1 보다 큰 작업은 최대 batch_size 개의 파일을 한 번에 꺼내며,
+        실행 슬롯은 파일 수와 관계없이 하나만 사용합니다.
+        """
+        with self._lock:
+            self.deferred = False
+            if self.running >= self.max_jobs:
+                return None
+            now = time.time()
+            candidates = [q for q in self.queues.values() if q.eligible(now)]
+            if not candidates:
+                return None
+            queue = min(candidates, key=lambda q: (-q.priority, q.vtime))
+            if self.admission is not None and not self._admit(queue, now):
+                queue = self._backfill(queue, candidates, now)
+                if queue is None:
+                    self.deferred = True
+                    return None
+            count = min(len(queue.pending), queue.batch_size)
+            jobs = [queue.pending.popleft() for _ in range(count)]
+            queue.vtime += count / queue.weight
+            queue.running += 1
+            self.running += 1
+            self._space.notify_all()
+            return jobs
+
+    def _admit(self, queue, now):
+        if self.admission.admit(queue.pending[0].job_id, queue.cpu, queue.mem, now):
+            queue.blocked_since = None
+            return True
+        if queue.blocked_since is None:
+            queue.blocked_since = now
+        return False
+
+    def _backfill(self, blocked, candidates, now):
+        """먼저 실행할 작업(blocked)이 자원 부족으로 밀리면, 자원에 맞는 다음 순서의 작업을 찾습니다.
+
+        밀린 작업이 STARVATION_TIMEOUT 이상 기다렸으면 다른 작업을 시작하지 않고 자원이 비기를 기다립니다.
+        """
+        if now - blocked.blocked_since >= STARVATION_TIMEOUT:
+            return None
+        for queue in sorted(candidates, key=lambda q: (-q.priority, q.vtime)):
+            if queue is not blocked and self._admit(queue, now):
+                return queue
+        return None
+
+    def next_batch_deadline(self):
+        """묶음을 기다리는 대기열 중 가장 먼저 실행해야 할 시각을 반환합니다. 없으면 None.
+
+        지금 실행할 수 없는 대기열(슬롯이 없거나 max_concurrency 에 도달)은 제외합니다.
+        release() 후 다시 확인하므로, 지난 시각으로 타이머를 계속 다시 거는 일이 없습니다.
+        자원이 부족해 미룬 경우에는 이미 지난 시각도 제외합니다 (TaskManager 가 따로 다시 확인).
+        """
+        with self._lock:
+            if self.running >= self.max_jobs:
+                return None
+            deadlines = [q.batch_deadline() for q in self.queues.values()
+                         if q.pending and q.batch_size > 1 and len(q.pending) < q.batch_size and
+                         q.running < q.max_concurrency]
+            if self.deferred:
+                now = time.time()
+                deadlines = [deadline for deadline in deadlines if deadline > now]
+            return min(deadlines, default=None)
+
+    def release(self, jobs):
+        """실행 슬롯을 반환합니다. 대기열 보충이 필요하면 True 를 반환합니다."""
+        with self._lock:
+            queue = self.queues[jobs[0].task_id]
+            queue.running -= 1
+            self.running -= 1
+            if self.admission is not None:
+                self.admission.release(jobs[0].job_id)
+            for job in jobs:
+                queue.known.discard(job.file_name)
+            if queue.retired:
+                if not queue.running and self.queues.get(queue.task_id) is queue:
+                    del self.queues[queue.task_id]
+                return False
+            if queue.overflowed and len(queue.pending) <= queue.queue_size // 2:
+                queue.overflowed = False
+                return True
+            return False
+
+    def adopt(self, jobs):
+        """이전 실행에서 넘겨받아 실행 중인 작업에 실행 슬롯 하나를 배정합니다. release() 로 반환합니다."""
+        with self._lock:
+            queue = self.queues[jobs[0].task_id]
+            queue.running += 1
+            self.running += 1
+            if self.admission is not None:
+                self.admission.reserve(jobs[0].job_id, queue.cpu, queue.mem)
+            for job in jobs:
+                queue.known.add(job.file_name)
+
+    def is_known(self, task_id, file_path):
+        with self._lock:
+            queue = self.queues.get(task_id)
+            return queue is not None and os.path.basename(file_path) in queue.known
+
+    def depth(self, task_id):
+        with self._lock:
+            queue = self.queues.get(task_id)
+            return len(queue.pending) if queue is not None else 0
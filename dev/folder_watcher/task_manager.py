@@ -1,70 +1,864 @@
 # 요구사항: PR-0001, FR-0006, FR-0008, FR-0009, FR-0010, FR-0011, FR-0012
+import asyncio
+import configparser
 import logging
 import os
 import shlex
-import shutil
 import subprocess
+import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from .admission import AdmissionController, JobCgroups, parse_size, MEMORY_BUCKETS, SAMPLE_INTERVAL
+from .cluster import ClusterNode, RUNNING_JOBS_LIMIT
+from .config import task_sections
+from .file_router import FileRouter, move_file
+from .history import HistoryIndex, DEFAULT_HISTORY_SIZE, DONE, FAILED
+from .job_registry import JobRegistry
+from .job_output import OutputStore, DEFAULT_SPILL_LIMIT, SPILL_NOTE
+from .journal import JobJournal, DEFAULT_KEEP_DAYS, DEFAULT_KEEP_ROWS
+from .metrics import MetricsRegistry
+from .scheduler import TaskScheduler, TaskQueue, DEFAULT_QUEUE_SIZE
+from .worker_pool import WorkerPool, WorkerError
 
 MAX_WORKERS = max(2, (os.cpu_count() or 1) - 2)
+PID_POLL_INTERVAL = 1.0     # 초, pidfd 를 쓸 수 없을 때 프로세스 종료를 확인하는 주기
+START_TIME_TOLERANCE = 2.0  # 초, pid 재사용 판별 시 허용 오차
+
+# app 을 감싸 종료 코드를 파일에 남기는 셸. 서비스가 재시작되어도 넘겨받은 작업의 결과를 알 수 있음.
+# FOLDER_WATCHER_CGROUP 이 있으면 app 을 실행하기 전에 자신을 실행별 cgroup 으로 옮김.
+# stdout/stderr 은 합쳐서 앞의 $1 바이트까지만 spill 파일에 쓰고 넘으면 $2 를 덧붙임. 나머지는 읽어서 버려
+# app 이 EPIPE 로 끝나지 않고, 서비스가 종료된 동안에도 출력 크기가 제한됨
+STATUS_SHIM = ('limit=$1; note=$2; shift 2; '
+               'if [ -n "$FOLDER_WATCHER_CGROUP" ]; then echo $$ > "$FOLDER_WATCHER_CGROUP/cgroup.procs"; fi; '
+               '{ "$@"; echo "$?" > "$FOLDER_WATCHER_STATUS"; } 2>&1 | '
+               '{ head -c "$limit"; if [ "$(head -c 1 | wc -c)" -gt 0 ]; then printf "%s" "$note"; cat > /dev/null; fi; }; '
+               'code=$(cat "$FOLDER_WATCHER_STATUS" 2>/dev/null); exit "${code:-1}"')
+
+def _attach_child_watcher(loop):
+    """자식 프로세스 회수를 스레드 없이 pidfd 로 처리하도록 child watcher 를 설정합니다."""
+    if sys.version_info >= (3, 12) or not hasattr(os, 'pidfd_open'):
+        return  # 3.12 이상은 사용 가능한 경우 pidfd 를 기본으로 사용
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        logging.warning("pidfd를 사용할 수 없어 기본 child watcher를 사용합니다.")
+        return
+    watcher = asyncio.PidfdChildWatcher()
+    asyncio.set_child_watcher(watcher)
+    watcher.attach_loop(loop)
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _process_started_at(pid):
+    """/proc 에서 프로세스 시작 시각(epoch)을 읽습니다. 알 수 없으면 None."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rpartition(')')[2].split()
+        with open("/proc/stat") as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        return boot_time + int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+async def _wait_exit(pid, alive):
+    """프로세스가 끝날 때까지 기다립니다. 이 프로세스의 자식이 아닌(이전 실행에서 넘겨받은) 프로세스에도 사용합니다.
+
+    pidfd 를 이벤트 루프에 등록해 스레드 없이 기다리며, 쓸 수 없으면 alive() 를 주기적으로 확인합니다.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        fd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return
+    except (AttributeError, OSError):
+        while alive():
+            await asyncio.sleep(PID_POLL_INTERVAL)
+        return
+    exited = loop.create_future()
+    loop.add_reader(fd, lambda: exited.done() or exited.set_result(None))
+    try:
+        await exited
+    finally:
+        loop.remove_reader(fd)
+        os.close(fd)
+
+def _read_status(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def _read_exit(work_prefixes):
+    """STATUS_SHIM 이 남긴 (종료 코드 또는 None, 파일별 결과) 를 읽습니다. 묶음은 첫 작업의 경로에 남습니다."""
+    for work_prefix in work_prefixes:
+        if os.path.exists(work_prefix + '.status') or os.path.exists(work_prefix + '.results'):
+            return _read_status(work_prefix + '.status'), _read_results(work_prefix + '.results')
+    return None, {}
+
+def _read_results(path):
+    """묶음 실행 결과 파일을 {파일 경로 또는 이름: 종료 코드} 로 읽습니다."""
+    results = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                code, sep, name = line.rstrip('\n').partition('\t')
+                if sep:
+                    try:
+                        results[name] = int(code)
+                    except ValueError:
+                        logging.warning(f"묶음 실행 결과를 해석할 수 없습니다: {line.strip()}")
+    except FileNotFoundError:
+        pass
+    return results
 
 class TaskManager:
     def __init__(self, config):
         self.config = config
-        self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='TaskWorker')
+        self.max_jobs = self.config.getint('common', 'max_jobs', fallback=MAX_WORKERS)
         self.pids_dir = self.config.get('common', 'pids')
-        logging.info(f"작업 관리자 초기화. 최대 동시 작업 수: {MAX_WORKERS}")
+        self.registry = JobRegistry()
+        journal_path = self.config.get('common', 'journal',
+                                       fallback=os.path.join(self.config.get('common', 'logs'), 'journal.db'))
+        self.journal = JobJournal(journal_path,
+                                  keep_days=self.config.getfloat('common', 'journal_keep_days', fallback=DEFAULT_KEEP_DAYS),
+                                  keep_rows=self.config.getint('common', 'journal_keep_rows', fallback=DEFAULT_KEEP_ROWS))
+        # 작업별 stdout/stderr 은 logs/jobs 아래에 실행(run_id)별로 구분해 저장
+        self.outputs = OutputStore(os.path.join(self.config.get('common', 'logs'), 'jobs'), self.journal.run_id,
+                                   self.config.getint('common', 'job_output_limit', fallback=DEFAULT_SPILL_LIMIT))
+        self.history = HistoryIndex(self.config.getint('common', 'history_size', fallback=DEFAULT_HISTORY_SIZE))
+        threading.Thread(target=self.history.load, args=(self.config,), name='HistoryLoader', daemon=True).start()
+        # max_jobs 안에서도 작업별 cpu/mem 힌트와 시스템 상태를 보고 실행을 미룰 수 있음
+        self.admission = AdmissionController(self.config)
+        self.scheduler = TaskScheduler(self.max_jobs, self.admission)
+        cgroup_root = self.config.get('common', 'cgroup', fallback='')
+        self.cgroups = JobCgroups(cgroup_root) if cgroup_root else None
+        num_tasks = self.config.getint('common', 'tasks', fallback=0)
+        for i in range(num_tasks):
+            task_id = str(i)
+            if task_id in self.config:
+                self.scheduler.add_queue(self._make_queue(task_id, self.config[task_id]))
+        self._batch_timer = None
+        self._batch_deadline = None
+        self._admission_timer = None
+        self._inflight = set()      # 실행 중인 _execute_task / _monitor_adopted
+        self.draining = False
+        self._pools = {}
+        self.router = FileRouter()
+        self._init_metrics()
+        self.cluster = None
+        if self.config.getboolean('common', 'cluster', fallback=False):
+            # 여러 노드가 같은 공유 유입 폴더를 감시하는 경우 실행 직전에 파일을 가져감
+            self.cluster = ClusterNode(self.config, self._node_status, self.submit_task)
+            self.cluster.start()
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, name='TaskLoop', daemon=True)
+        self._loop_thread.start()
+        logging.info(f"작업 관리자 초기화. 최대 동시 작업 수: {self.max_jobs}")
 
-    def submit_task(self, task_id, file_path):
-        self.executor.submit(self._execute_task, task_id, file_path)
-        
-    def _execute_task(self, task_id, file_path):
-        task_config = self.config[task_id]
-        file_name = os.path.basename(file_path)
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        _attach_child_watcher(self.loop)
+        self.loop.run_forever()
+
+    def _make_queue(self, task_id, task_config):
+        # 상주 작업자 모드는 작업자 수만큼만 동시에 보냄
+        default_concurrency = self.max_jobs
+        if task_config.get('mode', fallback='spawn') == 'persistent':
+            default_concurrency = task_config.getint('workers', fallback=1)
+        return TaskQueue(
+            task_id,
+            max_concurrency=task_config.getint('max_concurrency', fallback=default_concurrency),
+            priority=task_config.getint('priority', fallback=0),
+            weight=task_config.getfloat('weight', fallback=1.0),
+            queue_size=task_config.getint('queue_size', fallback=DEFAULT_QUEUE_SIZE),
+            batch_size=task_config.getint('batch_size', fallback=1),
+            batch_timeout=task_config.getfloat('batch_timeout', fallback=1.0),
+            cpu=task_config.getfloat('cpu', fallback=0.0),
+            mem=parse_size(task_config.get('mem', fallback='0')),
+        )
+
+    def _init_metrics(self):
+        """/metrics 로 내보낼 작업 처리 지표를 등록합니다."""
+        self.metrics = MetricsRegistry()
+        task_ids = lambda: list(self.scheduler.queues)
+        self.event_to_queue_seconds = self.metrics.histogram(
+            'folder_watcher_event_to_queue_seconds', "파일 감지부터 대기열 등록까지 걸린 시간(초)", ('task_id',))
+        self.queue_wait_seconds = self.metrics.histogram(
+            'folder_watcher_queue_wait_seconds', "대기열 등록부터 실행 시작까지 걸린 시간(초)", ('task_id',))
+        self.run_seconds = self.metrics.histogram(
+            'folder_watcher_run_seconds', "app 실행 시간(초)", ('task_id',))
+        self.move_seconds = self.metrics.histogram(
+            'folder_watcher_move_seconds', "결과 폴더로 파일을 옮기는 데 걸린 시간(초)", ('task_id',))
+        self.jobs_total = self.metrics.counter(
+            'folder_watcher_jobs_total', "종료된 작업 수 (result: done, failed)", ('task_id', 'result'))
+        self.moved_bytes_total = self.metrics.counter(
+            'folder_watcher_moved_bytes_total', "done/stop 폴더로 옮긴 파일의 바이트 수", ('task_id',))
+        self.metrics.gauge(
+            'folder_watcher_queue_depth', "대기열에 있는 파일 수", ('task_id',),
+            lambda: {(task_id,): self.scheduler.depth(task_id) for task_id in task_ids()})
+        self.metrics.gauge(
+            'folder_watcher_running_jobs', "실행 중인 파일 수", ('task_id',),
+            self._running_counts)
+        self.metrics.gauge(
+            'folder_watcher_slots_in_use', "사용 중인 실행 슬롯 수 (최대 max_jobs)", (),
+            lambda: {(): self.scheduler.running})
+        self.metrics.gauge(
+            'folder_watcher_slots', "전체 실행 슬롯 수 (max_jobs)", (),
+            lambda: {(): self.max_jobs})
+        self.metrics.gauge(
+            'folder_watcher_move_active', "실행 중이거나 대기 중인 파일 이동 수", (),
+            lambda: {(): self.router.active})
+        self.metrics.gauge(
+            'folder_watcher_move_workers', "파일 이동 스레드 수", (),
+            lambda: {(): self.router.max_workers})
+        self.admission_deferred_total = self.metrics.counter(
+            'folder_watcher_admission_deferred_total', "자원이 부족해 실행을 미룬 횟수")
+        self.metrics.gauge(
+            'folder_watcher_reserved_cpu', "실행 중인 작업이 예약한 CPU 코어 수 (cpu 힌트 합계)", (),
+            lambda: {(): self.admission.cpu_reserved})
+        self.metrics.gauge(
+            'folder_watcher_reserved_memory_bytes', "실행 중인 작업이 예약한 메모리 (mem 힌트 합계)", (),
+            lambda: {(): self.admission.mem_reserved})
+        self.metrics.gauge(
+            'folder_watcher_memory_available_bytes', "마지막으로 확인한 사용 가능 메모리 (MemAvailable)", (),
+            lambda: {(): self.admission.mem_available} if self.admission.mem_available is not None else {})
+        self.metrics.gauge(
+            'folder_watcher_load1', "마지막으로 확인한 1분 부하 평균", (),
+            lambda: {(): self.admission.load} if self.admission.load is not None else {})
+        self.job_cpu_seconds = self.metrics.histogram(
+            'folder_watcher_job_cpu_seconds', "실행 하나가 사용한 CPU 시간(초)", ('task_id',))
+        self.job_memory_peak_bytes = self.metrics.histogram(
+            'folder_watcher_job_memory_peak_bytes', "실행 하나의 최대 메모리 사용량", ('task_id',), MEMORY_BUCKETS)
+
+    def _running_counts(self):
+        counts = {(task_id,): 0 for task_id in self.scheduler.queues}
+        for job in self.registry.running():
+            counts[(job.task_id,)] = counts.get((job.task_id,), 0) + 1
+        return counts
 
-        if file_name.startswith('.'):
-            logging.info(f"숨김 파일 '{file_path}'은 건너뜁니다.")
+    def submit_task(self, task_id, file_path, detected_at=None, block=False):
+        """파일을 작업 대기열에 넣습니다. 중복이거나 대기열이 가득 차면 False 를 반환합니다.
+
+        block 이 True 이면 대기열에 자리가 날 때까지 기다립니다(시작 시 기존 파일 처리용).
+        """
+        if self.draining:
+            return False
+        job = self.registry.create(task_id, file_path, detected_at)
+        if not self.scheduler.push(job, block=block):
+            return False
+        self.registry.add(job)
+        self.journal.queued(job)
+        self.event_to_queue_seconds.observe(max(0.0, job.queued_at - job.detected_at), task_id)
+        self.loop.call_soon_threadsafe(self._dispatch)
+        return True
+
+    def _dispatch(self):
+        if self.draining:
             return
+        while (jobs := self.scheduler.pop()) is not None:
+            self._track(self._execute_task(jobs))
+        if self.scheduler.deferred:
+            self._schedule_admission_retry()
+        self._schedule_batch_timer()
+
+    def _schedule_admission_retry(self):
+        # 자원이 부족해 미룬 작업은 실행 중인 작업이 끝나지 않아도 시스템 상태가 바뀌면 시작되도록 다시 확인
+        self.admission_deferred_total.inc()
+        if self._admission_timer is None:
+            self._admission_timer = self.loop.call_later(SAMPLE_INTERVAL, self._retry_admission)
+
+    def _retry_admission(self):
+        self._admission_timer = None
+        self._dispatch()
+
+    def _track(self, coroutine):
+        task = self.loop.create_task(coroutine)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    def drain(self, timeout):
+        """새 작업을 받지 않고, 실행 중인 작업이 끝나기를 timeout 초까지 기다립니다.
+
+        대기 중인 파일은 유입 폴더에 그대로 남아 다음 실행에서 처리됩니다. 시간 안에 끝나지 않은
+        작업의 프로세스는 계속 실행되며, 다음 실행에서 넘겨받습니다. 모두 끝났으면 True 를 반환합니다.
+        """
+        self.draining = True
+        running = self.registry.running()
+        if running:
+            logging.info(f"실행 중인 작업 {len(running)}건이 끝나기를 최대 {timeout}초 기다립니다.")
 
-        pid_filename = f"{task_id}-{file_name}.pid"
-        pid_file_path = os.path.join(self.pids_dir, pid_filename)
+        async def wait_inflight():
+            for timer in (self._batch_timer, self._admission_timer):
+                if timer is not None:
+                    timer.cancel()
+            # draining 중에는 _dispatch 가 새 작업을 시작하지 않으므로 지금 실행 중인 작업만 기다림
+            if self._inflight:
+                await asyncio.wait(set(self._inflight), timeout=timeout)
+            return not self._inflight
 
-        if os.path.exists(pid_file_path):
-            logging.warning(f"이미 처리 중인 작업이므로 건너뜁니다: {task_id} - {file_name}")
+        try:
+            drained = asyncio.run_coroutine_threadsafe(wait_inflight(), self.loop).result(timeout + 5)
+        except Exception as e:
+            logging.warning(f"실행 중인 작업을 기다리는 중 오류 발생: {e}")
+            drained = False
+        if not drained:
+            remaining = self.registry.running()
+            logging.warning(f"시간 안에 끝나지 않은 작업 {len(remaining)}건은 계속 실행되며 다음 시작 시 넘겨받습니다: "
+                            f"{', '.join(job.file_name for job in remaining)}")
+        return drained
+
+    def _schedule_batch_timer(self):
+        # 묶음이 덜 찬 대기열은 batch_timeout 이 지나면 실행되도록 타이머 하나만 유지
+        deadline = self.scheduler.next_batch_deadline()
+        if deadline is None or (self._batch_timer is not None and self._batch_deadline <= deadline):
             return
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+        self._batch_deadline = deadline
+        self._batch_timer = self.loop.call_later(max(0.0, deadline - time.time()), self._on_batch_timer)
+
+    def _on_batch_timer(self):
+        self._batch_timer = None
+        self._dispatch()
+
+    def _release_slot(self, jobs):
+        if self.scheduler.release(jobs):
+            self.loop.run_in_executor(None, self._refill, jobs[0].task_id)
+        self._dispatch()
+
+    def _node_status(self):
+        """클러스터 heartbeat 에 기록할 이 노드의 상태입니다."""
+        running = self.registry.running()
+        return {
+            'max_jobs': self.max_jobs,
+            'running_count': len(running),
+            'running': [{'task_id': job.task_id, 'file_name': job.file_name, 'pid': job.pid,
+                         'started_at': job.started_at} for job in running[:RUNNING_JOBS_LIMIT]],
+            'queued': {task_id: self.scheduler.depth(task_id) for task_id in self.scheduler.queues},
+        }
+
+    def prepare_config(self, config, task_ids):
+        """다시 읽은 설정으로 추가/변경된 작업의 대기열을 미리 만들어 {task_id: TaskQueue} 로 반환합니다.
+
+        값이 잘못되었으면 아무것도 바꾸지 않고 ValueError 를 발생시킵니다. 결과는 apply_config 에 넘깁니다.
+        """
+        queues = {}
+        for task_id in task_ids:
+            try:
+                queues[task_id] = self._make_queue(task_id, config[task_id])
+            except (ValueError, configparser.Error) as e:
+                raise ValueError(f"[{task_id}] {e}") from e
+        return queues
+
+    def apply_config(self, config, added, removed, changed, queues):
+        """다시 읽은 설정을 적용합니다. 추가/삭제/변경된 작업의 대기열만 바꿉니다.
+
+        실행 중인 작업은 시작할 때의 설정으로 끝까지 실행되고, 변경된 작업의 대기 중인
+        파일은 새 설정으로 실행됩니다. 유입 폴더가 바뀌었거나 삭제된 작업의 대기 중인 파일은
+        이전 유입 폴더에 그대로 남습니다.
+        """
+        old_config = self.config
+        dropped = []
+        # 삭제된 작업의 대기열을 먼저 비워, 설정을 바꾼 뒤 이전 작업이 시작되지 않도록 함
+        for task_id in removed:
+            dropped.extend(self.scheduler.remove_queue(task_id))
+        self.config = config
+        max_jobs = config.getint('common', 'max_jobs', fallback=MAX_WORKERS)
+        if max_jobs != self.max_jobs:
+            logging.info(f"최대 동시 작업 수를 변경합니다: {self.max_jobs} -> {max_jobs}")
+            self.max_jobs = max_jobs
+            self.scheduler.resize(max_jobs)
+        self.admission.configure(config)
+        for task_id in changed:
+            keep_pending = old_config.get(task_id, 'in') == config.get(task_id, 'in')
+            dropped.extend(self.scheduler.replace_queue(queues[task_id], keep_pending))
+        for task_id in added:
+            self.scheduler.add_queue(queues[task_id])
+        for job in dropped:
+            self.registry.discard(job)
+            self.journal.skipped(job)
+
+        for task_id in removed + changed:
+            # 상주 작업자는 처리 중인 작업이 끝나면 종료되고, 다음 작업부터 새 설정으로 시작
+            pool = self._pools.pop(task_id, None)
+            if pool is not None:
+                asyncio.run_coroutine_threadsafe(pool.close(), self.loop)
+        history_tasks = added + [task_id for task_id in changed if any(
+            old_config.get(task_id, key) != config.get(task_id, key) for key in ('done', 'stop'))]
+        for task_id in removed + history_tasks:
+            self.history.forget(task_id)
+        if history_tasks:
+            threading.Thread(target=self.history.load, args=(config, history_tasks), name='HistoryLoader',
+                             daemon=True).start()
+        if self.cluster is not None:
+            self.cluster.set_folders({task_id: config[task_id]['in'] for task_id in task_sections(config)})
+        self.loop.call_soon_threadsafe(self._dispatch)
+
+    def close(self):
+        """상주 작업자를 종료하고 작업 기록(journal)에 남은 내용을 모두 씁니다.
+
+        아직 실행 중인 작업(상주 모드 제외)은 종료하지 않으며, 다음 시작 시 recover() 가 넘겨받습니다.
+        """
+        self.draining = True
+        if self.cluster is not None:
+            self.cluster.stop()
+        for pool in list(self._pools.values()):
+            try:
+                asyncio.run_coroutine_threadsafe(pool.close(), self.loop).result(timeout=10)
+            except Exception as e:
+                logging.warning(f"상주 작업자 종료 중 오류 발생: {e}")
+        self.journal.close()
+
+    def recover(self):
+        """이전 실행에서 끝나지 않은 작업을 journal 기준으로 정리하고 대기열을 복원합니다.
+
+        아직 실행 중인 프로세스는 넘겨받아 종료를 기다리고, 실행이 끝났지만 이동하지 못한
+        파일(서비스가 멈춘 사이 끝나 종료 코드만 남은 작업 포함)은 이동만 하며, 나머지는 다시 대기열에 넣습니다.
+        """
+        rows = self.journal.unfinished()
+        if rows:
+            logging.info(f"이전 실행에서 끝나지 않은 작업 {len(rows)}건을 복구합니다.")
+        # 실행 중인 프로세스를 먼저 넘겨받아 실행 슬롯을 차지해야 다시 넣는 작업이 max_jobs 를 넘지 않음
+        adopted = {}    # (run_id, pid) -> 같은 프로세스로 실행 중인 작업들의 journal 행
+        exited = {}     # (run_id, pid) -> 실행 중으로 기록되었지만 프로세스가 끝난 작업들의 journal 행
+        remaining = []
+        for row in rows:
+            task_id, file_path = row['task_id'], row['file_path']
+            if task_id not in self.config or not os.path.exists(file_path):
+                self.journal.resolve(row['run_id'], row['job_id'], 'lost')
+            elif row['state'] == 'running' and self._adoptable(row, self.config[task_id]):
+                adopted.setdefault((row['run_id'], row['pid']), []).append(row)
+            elif row['state'] == 'running':
+                exited.setdefault((row['run_id'], row['pid']), []).append(row)
+            else:
+                remaining.append(row)
+        work_prefixes = []
+        for group in adopted.values():
+            work_prefixes.extend(self._adopt(group))
+        for group in exited.values():
+            # 서비스가 멈춘 사이 끝난 작업은 남은 종료 코드대로 옮기고, 종료 코드가 없을 때만 다시 실행
+            if _read_exit(self._work_prefixes(group))[0] is not None:
+                work_prefixes.extend(self._adopt(group, exited=True))
+            else:
+                remaining.extend(group)
+
+        for row in remaining:
+            task_id, file_path = row['task_id'], row['file_path']
+            task_config = self.config[task_id]
+            file_name = os.path.basename(file_path)
+            pid_file_path = os.path.join(self.pids_dir, f"{task_id}-{file_name}.pid")
+
+            if os.path.exists(pid_file_path):
+                os.remove(pid_file_path)
+
+            if row['state'] == 'finished':
+                # 실행은 끝났지만 파일 이동 전에 중단된 경우, 종료 코드에 따라 이동만 수행
+                status, folder_key = (DONE, 'done') if row['exit_code'] == 0 else (FAILED, 'stop')
+                destination = os.path.join(task_config[folder_key], file_name)
+                move_file(file_path, destination)
+                self.history.record(task_id, file_name, status)
+                logging.info(f"[{task_config['name']}] 종료된 작업의 파일 이동을 복구했습니다: '{file_name}' -> '{destination}'")
+                self.journal.resolve(row['run_id'], row['job_id'], 'moved')
+                continue
+
+            self.submit_task(task_id, file_path)
+            self.journal.resolve(row['run_id'], row['job_id'], 'requeued')
+
+        self._clean_pids_dir(work_prefixes)
+        if self.cgroups is not None and self.cgroups.enabled:
+            self._clean_cgroups(work_prefixes)
+
+        if self.cluster is not None:
+            # journal 로 복구하지 못한 채 이 노드의 작업 폴더에 남은 파일은 유입 폴더로 되돌림
+            for task_id in self.cluster.folders:
+                self.cluster.release_own(task_id, lambda path, task_id=task_id: (
+                    self.scheduler.is_known(task_id, path) or
+                    os.path.exists(os.path.join(self.pids_dir, f"{task_id}-{os.path.basename(path)}.pid"))))
+
+    def _adoptable(self, row, task_config):
+        """journal 의 실행 중 작업이 아직 같은 프로세스로 실행 중인지 확인합니다."""
+        if task_config.get('mode', fallback='spawn') == 'persistent':
+            return False    # 상주 작업자는 서비스와 함께 종료되므로 다시 실행
+        if not _pid_alive(row['pid']):
+            return False
+        # 종료 후 같은 pid 가 다른 프로세스에 재사용된 경우를 걸러냄
+        started_at = _process_started_at(row['pid'])
+        return started_at is None or row['started_at'] is None or \
+            started_at <= row['started_at'] + START_TIME_TOLERANCE
+
+    def _work_prefixes(self, rows):
+        return [self._work_prefix(row['task_id'], row['run_id'], row['job_id']) for row in rows]
+
+    def _adopt(self, rows, exited=False):
+        """이전 실행에서 시작되어 아직 실행 중인 프로세스를 넘겨받아 종료를 기다립니다.
+
+        exited 이면 이미 끝난 프로세스이므로 기다리지 않고 남은 종료 코드대로 파일을 옮깁니다.
+        """
+        first = rows[0]
+        task_id, pid = first['task_id'], first['pid']
+        task_config = self.config[task_id]
+        jobs = []
+        for row in rows:
+            job = self.registry.create(task_id, row['file_path'], row['detected_at'])
+            job.queued_at = row['queued_at'] or job.queued_at
+            jobs.append(job)
+        self.scheduler.adopt(jobs)
+        for job, row in zip(jobs, rows):
+            self.registry.mark_running(job, pid)
+            job.started_at = row['started_at'] or job.started_at
+            self.journal.queued(job)
+            self.journal.started(job)
+            self.journal.resolve(row['run_id'], row['job_id'], 'adopted')
+        logging.info(f"[{task_config['name']}] {'서비스가 멈춘 사이 끝난' if exited else '실행 중인'} 이전 작업을 "
+                     f"넘겨받았습니다: {', '.join(job.file_name for job in jobs)} (PID {pid})")
+        work_prefixes = self._work_prefixes(rows)
+        # 출력은 묶음의 첫 작업 기준 spill 파일에 계속 쓰이고 있음
+        output_paths = [self.outputs.path(task_id, row['job_id'], first['run_id']) for row in rows]
+        self.loop.call_soon_threadsafe(
+            self._track, self._monitor_adopted(jobs, task_config, None if exited else pid, work_prefixes, output_paths))
+        return work_prefixes
 
-        logging.info(f"작업 제출: [{task_config['name']}] 파일: {file_name}")
-        process = None
+    async def _monitor_adopted(self, jobs, task_config, pid, work_prefixes, output_paths):
+        """넘겨받은 작업이 끝나기를 기다려 파일을 옮깁니다. pid 가 None 이면 이미 끝난 작업입니다."""
+        return_code = None
+        exit_codes = {}
+        output = None
+        cgroup_path = self.cgroups.path(self._cgroup_name(work_prefixes[0])) if self.cgroups is not None else None
         try:
-            command = [task_config['app']] + shlex.split(task_config['param']) + [file_path]
-            logging.info(f"[{task_config['name']}] 명령어 실행: {' '.join(command)}")
-            
-            process = subprocess.Popen(command)
-            with open(pid_file_path, 'w') as f:
-                f.write(str(process.pid))
-
-            return_code = process.wait()
-            
-            if return_code == 0:
-                destination = os.path.join(task_config['done'], file_name)
-                shutil.move(file_path, destination)
-                logging.info(f"[{task_config['name']}] 작업 성공: '{file_name}' -> '{destination}'")
+            output_path = next((path for path in output_paths if os.path.exists(path)), None)
+            if output_path is not None:
+                output = self.outputs.resume(jobs, output_path)
+            if pid is not None:
+                exited = _wait_exit(pid, lambda: _pid_alive(pid))
+                await (exited if output is None else self.outputs.capture(output, exited))
+            if cgroup_path is not None and os.path.isdir(cgroup_path):
+                self._record_usage(jobs, task_config, cgroup_path)
+            # 종료 코드는 STATUS_SHIM 이 남긴 파일에서 읽음
+            return_code, results = _read_exit(work_prefixes)
+            exit_codes.update(results)
+            await self._route_results(jobs, task_config, return_code, exit_codes)
+        except Exception as e:
+            await self._route_on_error(jobs, task_config, e)
+        finally:
+            if output is not None:
+                self.outputs.finish(output)
+            self._finish_jobs(jobs, return_code, exit_codes)
+            for work_prefix in work_prefixes:
+                self._remove_work_files(work_prefix)
+            if cgroup_path is not None and os.path.isdir(cgroup_path):
+                self.cgroups.remove(cgroup_path)
+            self._release_slot(jobs)
+
+    def _clean_pids_dir(self, work_prefixes):
+        """실행 중인 프로세스가 없는 pid 파일과 이전 실행의 작업 파일을 지웁니다. 넘겨받은 작업의 파일은 남깁니다."""
+        current = f"-{self.journal.run_id}-"
+        keep = tuple(os.path.basename(work_prefix) + '.' for work_prefix in work_prefixes)
+        running = {job.file_name for job in self.registry.running()}
+        try:
+            with os.scandir(self.pids_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.run-'):
+                        if current not in entry.name and not entry.name.startswith(keep):
+                            os.remove(entry.path)
+                    elif entry.name.endswith('.pid'):
+                        if entry.name.partition('-')[2][:-len('.pid')] in running:
+                            continue    # 넘겨받았거나 다시 시작한 작업의 pid 파일은 작업이 끝날 때 지움
+                        try:
+                            with open(entry.path) as f:
+                                pid = int(f.read().strip() or 0)
+                        except (OSError, ValueError):
+                            pid = 0
+                        if not _pid_alive(pid):
+                            os.remove(entry.path)
+                            logging.info(f"실행 중인 프로세스가 없는 pid 파일을 삭제했습니다: {entry.name}")
+                        else:
+                            logging.warning(f"기록에 없는 작업이 실행 중입니다: {entry.name} (PID {pid})")
+        except FileNotFoundError:
+            pass
+
+    def _clean_cgroups(self, work_prefixes):
+        """비정상 종료로 남은 이전 실행의 cgroup 을 지웁니다. 넘겨받은 작업의 cgroup 은 남깁니다."""
+        keep = {self._cgroup_name(work_prefix) for work_prefix in work_prefixes}
+        current = f"-{self.journal.run_id}-"
+        try:
+            with os.scandir(self.cgroups.root) as entries:
+                for entry in entries:
+                    if entry.name.startswith('run-') and entry.is_dir() and \
+                            entry.name not in keep and current not in entry.name:
+                        self.cgroups.remove(entry.path)
+        except OSError as e:
+            logging.warning(f"cgroup 폴더를 정리할 수 없습니다: {e}")
+
+    def _refill(self, task_id):
+        """대기열이 넘쳐 받지 못했던 파일을 유입 폴더에서 다시 채웁니다."""
+        task_config = self.config[task_id]
+        logging.info(f"[{task_config['name']}] 대기열 여유가 생겨 유입 폴더에서 파일을 다시 채웁니다.")
+        try:
+            with os.scandir(task_config['in']) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    if self.scheduler.is_known(task_id, entry.path):
+                        continue
+                    if not self.submit_task(task_id, entry.path) and self.scheduler.queues[task_id].overflowed:
+                        break
+        except FileNotFoundError:
+            logging.error(f"유입 폴더를 찾을 수 없습니다: {task_config['in']}")
+
+    async def _execute_task(self, jobs):
+        interval = 0
+        try:
+            if not self.config.has_section(jobs[0].task_id):
+                # 꺼낸 뒤 시작하기 전에 설정을 다시 읽어 작업이 삭제된 경우, 대기 중이던 파일처럼 유입 폴더에 남김
+                for job in jobs:
+                    self.registry.discard(job)
+                    self.journal.skipped(job)
+                return
+            task_config = self.config[jobs[0].task_id]
+            interval = task_config.getint('interval', fallback=0)
+            await self._run_jobs(jobs, task_config)
+        finally:
+            # interval 동안 슬롯을 유지하되, 스레드를 재우지 않고 타이머로 반환
+            if interval > 0:
+                self.loop.call_later(interval, self._release_slot, jobs)
             else:
-                destination = os.path.join(task_config['stop'], file_name)
-                shutil.move(file_path, destination)
-                logging.warning(f"[{task_config['name']}] 작업 실패 (종료 코드 {return_code}): '{file_name}' -> '{destination}'")
+                self._release_slot(jobs)
+
+    def _pool(self, task_id, task_config):
+        pool = self._pools.get(task_id)
+        if pool is None:
+            pool = WorkerPool(
+                task_config['name'],
+                [task_config['app']] + shlex.split(task_config['param']),
+                size=task_config.getint('workers', fallback=1),
+                max_jobs_per_worker=task_config.getint('worker_max_jobs', fallback=0),
+                job_timeout=task_config.getfloat('job_timeout', fallback=0),
+                health_interval=task_config.getfloat('health_interval', fallback=30),
+            )
+            self._pools[task_id] = pool
+        return pool
+
+    def _pid_file_path(self, job):
+        # pid 파일은 비정상 종료 후 복구를 위한 기록이며, 상태 조회는 registry 를 사용
+        return os.path.join(self.pids_dir, f"{job.task_id}-{job.file_name}.pid")
+
+    def _prepare(self, job):
+        """실행할 수 없는 작업을 걸러냅니다. 실행할 작업이면 True 를 반환합니다."""
+        if job.file_name.startswith('.'):
+            logging.info(f"숨김 파일 '{job.file_path}'은 건너뜁니다.")
+        elif not os.path.exists(job.file_path):
+            # 대기 중에 다른 경로(이벤트/시작 시 검사)로 이미 처리된 파일
+            pass
+        elif os.path.exists(self._pid_file_path(job)):
+            logging.warning(f"이미 처리 중인 작업이므로 건너뜁니다: {job.task_id} - {job.file_name}")
+        elif self.cluster is None:
+            return True
+        elif (claimed_path := self.cluster.claim(job.task_id, job.file_path)) is None:
+            logging.info(f"다른 노드가 먼저 가져간 파일이므로 건너뜁니다: {job.task_id} - {job.file_name}")
+        else:
+            # 이후 실행과 이동은 이 노드의 작업 폴더에 있는 파일을 대상으로 함
+            job.file_path = claimed_path
+            return True
+        self.registry.discard(job)
+        self.journal.skipped(job)
+        return False
+
+    async def _run_jobs(self, jobs, task_config):
+        """파일 하나 또는 묶음(batch_size > 1)을 한 번의 app 실행으로 처리합니다.
+
+        묶음 실행 시 app 은 FOLDER_WATCHER_RESULTS 환경 변수가 가리키는 파일에
+        "<종료 코드>\t<파일 경로 또는 이름>" 형식으로 파일별 결과를 쓸 수 있습니다.
+        결과가 없는 파일은 프로세스의 종료 코드를 따릅니다.
+        mode = persistent 인 작업은 새 프로세스 대신 상주 작업자에게 파일 경로를 보냅니다.
+        app 의 stdout/stderr 은 합쳐서 실행별로 저장되어 대시보드에서 볼 수 있습니다 (OutputStore).
+        """
+        jobs = [job for job in jobs if self._prepare(job)]
+        if not jobs:
+            return
+
+        task_id = jobs[0].task_id
+        if task_config.get('mode', fallback='spawn') == 'persistent':
+            return await self._run_jobs_persistent(jobs, task_config)
+        batch_mode = task_config.getint('batch_size', fallback=1) > 1
+        work_prefix = self._work_prefix(task_id, self.journal.run_id, jobs[0].job_id)
+        status_path = work_prefix + '.status'
+        results_path = manifest_path = output = cgroup_path = None
+        return_code = None
+        exit_codes = {}
+
+        logging.info(f"작업 제출: [{task_config['name']}] 파일: {', '.join(job.file_name for job in jobs)}")
+        try:
+            arguments = [job.file_path for job in jobs]
+            env = dict(os.environ, FOLDER_WATCHER_STATUS=status_path)
+            if batch_mode:
+                results_path = work_prefix + '.results'
+                env['FOLDER_WATCHER_RESULTS'] = results_path
+                if task_config.get('batch_args', fallback='argv') == 'manifest':
+                    manifest_path = work_prefix + '.manifest'
+                    with open(manifest_path, 'w', encoding='utf-8') as f:
+                        f.write(''.join(path + '\n' for path in arguments))
+                    arguments = [manifest_path]
+
+            command = [task_config['app']] + shlex.split(task_config['param']) + arguments
+            logging.info(f"[{task_config['name']}] 명령어 실행: {' '.join(command)}")
+
+            if self.cgroups is not None:
+                cgroup_path = self.cgroups.create(self._cgroup_name(work_prefix),
+                                                  task_config.getfloat('cpu_limit', fallback=0.0),
+                                                  parse_size(task_config.get('mem_limit', fallback='0')))
+                if cgroup_path is not None:
+                    env['FOLDER_WATCHER_CGROUP'] = cgroup_path
+
+            # 자식은 별도 세션으로 실행해 서비스가 재시작되어도 계속 실행되고, 다음 실행에서 넘겨받음.
+            # 출력도 서비스와 연결된 파이프 대신 spill 파일에 직접 쓰게 해 서비스가 종료되어도 끊기지 않음
+            output = self.outputs.create(jobs)
+            with open(output.path, 'ab') as stdout:
+                process = subprocess.Popen(['/bin/sh', '-c', STATUS_SHIM, 'folder-watcher',
+                                            str(output.spill_limit), SPILL_NOTE] + command, env=env,
+                                           stdout=stdout, stderr=subprocess.STDOUT, start_new_session=True)
+            self._mark_running(jobs, process.pid)
+
+            return_code, rusage = await self.outputs.capture(output, self._wait_child(process))
+            self._record_usage(jobs, task_config, cgroup_path, rusage)
+            if results_path is not None:
+                exit_codes.update(_read_results(results_path))
+            await self._route_results(jobs, task_config, return_code, exit_codes)
 
         except Exception as e:
-            logging.error(f"[{task_config['name']}] 작업 실행 중 예외 발생: {e}", exc_info=True)
-            if os.path.exists(file_path):
-                destination = os.path.join(task_config['stop'], file_name)
-                shutil.move(file_path, destination)
-                logging.warning(f"[{task_config['name']}] 예외 발생으로 파일 이동: '{file_name}' -> '{destination}'")
+            await self._route_on_error(jobs, task_config, e)
         finally:
+            if output is not None:
+                self.outputs.finish(output)
+            self._finish_jobs(jobs, return_code, exit_codes)
+            self._remove_work_files(work_prefix)
+            if cgroup_path is not None:
+                self.cgroups.remove(cgroup_path)
+
+    async def _wait_child(self, process):
+        """자식이 끝나기를 기다려 (종료 코드, 자원 사용량 또는 None) 을 반환합니다."""
+        await _wait_exit(process.pid, lambda: process.poll() is None)
+        # waitpid 대신 wait4 로 회수해 app 의 CPU 시간과 최대 메모리(RSS)를 함께 얻음
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            return process.wait(), None     # pidfd 를 쓸 수 없어 poll() 이 이미 회수한 경우
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode, rusage
+
+    def _cgroup_name(self, work_prefix):
+        return os.path.basename(work_prefix).lstrip('.')
+
+    def _record_usage(self, jobs, task_config, cgroup_path, rusage=None):
+        """실행 하나의 실제 CPU 시간과 최대 메모리를 지표로 남기고, mem 힌트를 넘었으면 경고합니다.
+
+        cgroup 을 쓰면 하위 프로세스를 모두 포함한 cgroup 의 값을, 아니면 wait4 의 값을 사용합니다.
+        wait4 의 최대 메모리에는 exec 전 fork 된 서비스 프로세스의 크기가 포함되어 작은 app 은 크게 나옵니다.
+        """
+        cpu_seconds, memory_peak = self.cgroups.usage(cgroup_path) if cgroup_path else (None, None)
+        if rusage is not None:
+            if cpu_seconds is None:
+                cpu_seconds = rusage.ru_utime + rusage.ru_stime
+            if memory_peak is None:
+                memory_peak = rusage.ru_maxrss * 1024
+        task_id = jobs[0].task_id
+        if cpu_seconds is not None:
+            self.job_cpu_seconds.observe(cpu_seconds, task_id)
+        if memory_peak is not None:
+            self.job_memory_peak_bytes.observe(memory_peak, task_id)
+            mem = parse_size(task_config.get('mem', fallback='0'))
+            if 0 < mem < memory_peak:
+                logging.warning(f"[{task_config['name']}] 최대 메모리 사용량 {memory_peak // 2 ** 20} MiB 가 "
+                                f"mem 힌트({mem // 2 ** 20} MiB)를 넘었습니다: {', '.join(job.file_name for job in jobs)}")
+
+    def _work_prefix(self, task_id, run_id, job_id):
+        # 묶음 목록, 결과, 종료 코드 파일의 공통 경로. 실행(run_id)마다 job_id 가 다시 시작되므로 함께 사용
+        return os.path.join(self.pids_dir, f".run-{task_id}-{run_id}-{job_id}")
+
+    def _remove_work_files(self, work_prefix):
+        for suffix in ('.status', '.results', '.manifest'):
+            if os.path.exists(work_prefix + suffix):
+                os.remove(work_prefix + suffix)
+
+    async def _run_jobs_persistent(self, jobs, task_config):
+        pool = self._pool(jobs[0].task_id, task_config)
+        return_code = None
+        exit_codes = {}
+        worker = None
+        healthy = False
+        try:
+            worker = await pool.acquire()
+            logging.info(f"[{task_config['name']}] 상주 작업자(PID {worker.pid})에 전달: {', '.join(job.file_name for job in jobs)}")
+            self._mark_running(jobs, worker.pid)
+
+            return_code, results = await pool.run(worker, [job.file_path for job in jobs])
+            healthy = True
+            exit_codes.update(results)
+            await self._route_results(jobs, task_config, return_code, exit_codes)
+
+        except Exception as e:
+            await self._route_on_error(jobs, task_config, e)
+        finally:
+            self._finish_jobs(jobs, return_code, exit_codes)
+            if worker is not None:
+                await pool.release(worker, healthy)
+
+    def _mark_running(self, jobs, pid):
+        for job in jobs:
+            self.registry.mark_running(job, pid)
+            self.journal.started(job)
+            self.queue_wait_seconds.observe(job.started_at - job.queued_at, job.task_id)
+            with open(self._pid_file_path(job), 'w') as f:
+                f.write(str(pid))
+
+    async def _route_results(self, jobs, task_config, return_code, exit_codes):
+        """파일별 결과(없으면 전체 종료 코드)에 따라 파일을 옮깁니다. exit_codes 를 파일별 결과로 채웁니다."""
+        finished_at = time.time()
+        for job in jobs:
+            code = exit_codes.get(job.file_path, exit_codes.get(job.file_name, return_code))
+            exit_codes[job.file_path] = code
+            self.journal.finished(job, code, finished_at)
+            self.run_seconds.observe(finished_at - job.started_at, job.task_id)
+            if code == 0:
+                destination = await self._route(job, task_config, DONE)
+                logging.info(f"[{task_config['name']}] 작업 성공: '{job.file_name}' -> '{destination}'")
+            else:
+                destination = await self._route(job, task_config, FAILED)
+                logging.warning(f"[{task_config['name']}] 작업 실패 (종료 코드 {code}): '{job.file_name}' -> '{destination}'")
+
+    async def _route_on_error(self, jobs, task_config, error):
+        logging.error(f"[{task_config['name']}] 작업 실행 중 예외 발생: {error}", exc_info=not isinstance(error, WorkerError))
+        for job in jobs:
+            if os.path.exists(job.file_path):
+                destination = await self._route(job, task_config, FAILED)
+                logging.warning(f"[{task_config['name']}] 예외 발생으로 파일 이동: '{job.file_name}' -> '{destination}'")
+
+    def _finish_jobs(self, jobs, return_code, exit_codes):
+        for job in jobs:
+            self.registry.mark_finished(job, exit_codes.get(job.file_path, return_code))
+            self.jobs_total.inc(job.task_id, job.state)
+            pid_file_path = self._pid_file_path(job)
             if os.path.exists(pid_file_path):
                 os.remove(pid_file_path)
-            
-            interval = task_config.getint('interval', fallback=0)
-            if interval > 0:
-                time.sleep(interval)
\ No newline at end of file
+
+    async def _route(self, job, task_config, status):
+        """처리 결과에 따라 파일을 done 또는 stop 폴더로 옮기고 이력에 기록합니다."""
+        folder_key = 'done' if status == DONE else 'stop'
+        destination = os.path.join(task_config[folder_key], job.file_name)
+        started = time.monotonic()
+        size = await self.router.move(self.loop, job.file_path, destination)
+        move_seconds = time.monotonic() - started
+        self.journal.moved(job, destination, move_seconds)
+        self.move_seconds.observe(move_seconds, job.task_id)
+        self.moved_bytes_total.inc(job.task_id, amount=size)
+        self.history.record(job.task_id, job.file_name, status)
+        return destination
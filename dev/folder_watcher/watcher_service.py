@@ -1,78 +1,244 @@
 # 요구사항: CR-0005, FR-0005, FR-0006, FR-0007
+import configparser
 import logging
 import os
+import threading
 import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+from .config import read_config, diff_tasks, validate_config
+from .polling import PollingWatcher
+from .readiness import ReadinessTracker, DEFAULT_QUIET_PERIOD
 from .task_manager import TaskManager
 
+DEFAULT_DRAIN_TIMEOUT = 30     # 초
+RELOAD_QUIET_PERIOD = 1.0      # 초, 설정 파일 저장이 끝나기를 기다리는 시간
+# 시작할 때만 읽으므로 바꾸면 재시작이 필요한 [common] 항목
+RESTART_KEYS = ('pids', 'logs', 'journal', 'journal_keep_days', 'journal_keep_rows', 'cluster', 'node_id', 'lease_timeout',
+                'history_size', 'job_output_limit', 'cgroup')
+
 class TaskEventHandler(FileSystemEventHandler):
-    def __init__(self, task_id, task_config, task_manager):
+    def __init__(self, task_id, task_config, task_manager, readiness=None):
         self.task_id = task_id
         self.task_config = task_config
         self.task_manager = task_manager
+        self.readiness = readiness
+        self.folder = os.path.normpath(task_config['in'])
+        self.quiet_period = task_config.getfloat('quiet_period', fallback=DEFAULT_QUIET_PERIOD)
+        self.active = True      # 설정을 다시 읽어 감시를 멈추면 대기 중이던 후보도 제출하지 않음
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def _check_and_submit(self, file_path):
+    def _check_and_submit(self, file_path, detected_at=None):
         file_name = os.path.basename(file_path)
-        if not file_name.startswith('.'):
+        if self.active and not file_name.startswith('.'):
             self.logger.info(f"파일 감지됨: {file_path} (작업: {self.task_config['name']})")
-            self.task_manager.submit_task(self.task_id, file_path)
+            self.task_manager.submit_task(self.task_id, file_path, detected_at=detected_at or time.time())
 
     def on_any_event(self, event):
         if event.event_type == 'moved':
             self.logger.info(f"이동 감지됨: {event.src_path} -> {event.dest_path}")
         if event.is_directory:
             return
+        now = time.time()
         match event.event_type:
             case 'closed':      # completely copied
-                self._check_and_submit(event.src_path)
-            case 'created':     # hardlink created
-                if os.stat(event.src_path).st_nlink > 1:
-                    self._check_and_submit(event.src_path)
+                self._ready(event.src_path, now)
+            case 'created':
+                try:
+                    hardlink = os.stat(event.src_path).st_nlink > 1
+                except FileNotFoundError:
+                    return
+                if hardlink:    # hardlink created
+                    self._ready(event.src_path, now)
+                else:           # 쓰는 중이거나 다른 폴더에서 rename 되어 들어온 파일
+                    self._touch(event.src_path, now)
+            case 'modified':    # 닫지 않고 계속 쓰는 경우
+                self._touch(event.src_path, now)
+            case 'moved':       # rsync 등 임시 파일을 rename 해 완성하는 경우
+                self._discard(event.src_path)
+                if os.path.dirname(os.path.normpath(event.dest_path)) == self.folder:
+                    self._ready(event.dest_path, now)
+            case 'deleted':
+                self._discard(event.src_path)
             case _:             # ignore other events
                 pass
 
+    def _ready(self, file_path, detected_at):
+        if self.readiness is None:
+            self._check_and_submit(file_path, detected_at)
+        elif not os.path.basename(file_path).startswith('.'):
+            self.readiness.ready(file_path, self._check_and_submit, detected_at)
+
+    def _touch(self, file_path, detected_at):
+        if self.readiness is not None and not os.path.basename(file_path).startswith('.'):
+            self.readiness.touch(file_path, self._check_and_submit, self.quiet_period, detected_at)
+
+    def _discard(self, file_path):
+        if self.readiness is not None:
+            self.readiness.discard(file_path)
+
+
+class ConfigFileHandler(FileSystemEventHandler):
+    """설정 파일이 바뀌면 저장이 끝나기를 잠시 기다렸다가 다시 읽습니다."""
+    def __init__(self, config_path, readiness, reload):
+        self.config_path = os.path.normpath(config_path)
+        self.readiness = readiness
+        self.reload = reload
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ('created', 'modified', 'moved', 'closed'):
+            return
+        # 편집기는 임시 파일에 쓴 뒤 rename 하거나 여러 번 나눠 쓰므로, 마지막 이벤트 후 한 번만 다시 읽음
+        paths = (event.src_path, getattr(event, 'dest_path', ''))
+        if self.config_path in (os.path.normpath(path) for path in paths if path):
+            self.readiness.touch(self.config_path, self._changed, RELOAD_QUIET_PERIOD, time.time())
+
+    def _changed(self, path, detected_at):
+        try:
+            self.reload()
+        except ValueError as e:
+            logging.getLogger(self.__class__.__name__).error(f"설정을 다시 읽지 못해 기존 설정을 유지합니다: {e}")
+
 
 class WatcherService:
-    def __init__(self, config, task_manager):
+    def __init__(self, config, task_manager, config_path=None):
         self.config = config
         self.task_manager = task_manager
+        self.config_path = config_path      # 지정하면 파일이 바뀔 때 설정을 다시 읽음
         self.observer = Observer()
+        self.watches = {}       # task_id -> (TaskEventHandler, ObservedWatch 또는 PollingWatcher)
+        self.readiness = ReadinessTracker()
+        self._reload_lock = threading.Lock()
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def start(self):
+        # 이전 실행에서 대기 중이던 작업을 먼저 복원한 뒤 유입 폴더를 확인
+        try:
+            self.task_manager.recover()
+        except Exception as e:
+            self.logger.error(f"작업 기록(journal) 기반 복구 실패: {e}", exc_info=True)
+
+        backlog = []
         num_tasks = self.config.getint('common', 'tasks', fallback=0)
         for i in range(num_tasks):
             task_id = str(i)
             if task_id in self.config:
-                task_config = self.config[task_id]
-                
-                for folder_key in ['in', 'done', 'stop']:
-                    folder_path = task_config[folder_key]
-                    if not os.path.isdir(folder_path):
-                        self.logger.warning(f"설정된 폴더를 찾을 수 없습니다: '{folder_path}'.")
-                
-                self.logger.info(f"[{task_config['name']}] 시작 시 기존 파일 처리 중...")
-                try:
-                    for filename in os.listdir(task_config['in']):
-                        if filename.startswith('.'):
-                            continue
-                        file_path = os.path.join(task_config['in'], filename)
-                        if os.path.isfile(file_path):
-                            self.task_manager.submit_task(task_id, file_path)
-                except FileNotFoundError:
-                     self.logger.error(f"유입 폴더를 찾을 수 없어 기존 파일을 처리할 수 없습니다: {task_config['in']}")
-
-                event_handler = TaskEventHandler(task_id, task_config, self.task_manager)
-                self.observer.schedule(event_handler, task_config['in'], recursive=False)
-                self.logger.info(f"폴더 감시 시작: '{task_config['in']}' (작업: {task_config['name']})")
+                self._watch_task(task_id, self.config[task_id])
+                backlog.append(task_id)
 
+        if self.config_path is not None:
+            handler = ConfigFileHandler(self.config_path, self.readiness, self.reload)
+            self.observer.schedule(handler, os.path.dirname(os.path.abspath(self.config_path)), recursive=False)
+        self.readiness.start()
         self.observer.start()
         self.logger.info("모든 감시 서비스가 시작되었습니다.")
 
+        # 감시를 먼저 시작하고, 기존 파일은 작업별 스레드에서 대기열 여유에 맞춰 흘려 넣음
+        self._start_backlog(backlog)
+
+    def _watch_task(self, task_id, task_config):
+        for folder_key in ['in', 'done', 'stop']:
+            folder_path = task_config[folder_key]
+            if not os.path.isdir(folder_path):
+                self.logger.warning(f"설정된 폴더를 찾을 수 없습니다: '{folder_path}'.")
+
+        event_handler = TaskEventHandler(task_id, task_config, self.task_manager, self.readiness)
+        if task_config.get('backend', fallback='inotify') == 'poll':
+            # 네트워크 폴더는 inotify 이벤트가 오지 않으므로 주기적으로 확인
+            poller = PollingWatcher(task_id, task_config, event_handler._check_and_submit)
+            poller.start()
+            self.watches[task_id] = (event_handler, poller)
+            self.logger.info(f"폴더 감시 시작 (폴링): '{task_config['in']}' (작업: {task_config['name']})")
+        else:
+            watch = self.observer.schedule(event_handler, task_config['in'], recursive=False)
+            self.watches[task_id] = (event_handler, watch)
+            self.logger.info(f"폴더 감시 시작: '{task_config['in']}' (작업: {task_config['name']})")
+
+    def _unwatch_task(self, task_id):
+        if task_id not in self.watches:
+            return      # 감시를 시작하지 못한 작업
+        event_handler, watch = self.watches.pop(task_id)
+        event_handler.active = False
+        if isinstance(watch, PollingWatcher):
+            watch.stop()
+        elif any(other == watch for _, other in self.watches.values()):
+            # 같은 폴더를 감시하는 다른 작업이 있으면 이 작업의 처리기만 제거
+            self.observer.remove_handler_for_watch(event_handler, watch)
+        else:
+            self.observer.unschedule(watch)
+        self.logger.info(f"폴더 감시 중단: '{event_handler.task_config['in']}' (작업: {event_handler.task_config['name']})")
+
+    def _start_backlog(self, task_ids):
+        for task_id in task_ids:
+            threading.Thread(target=self._scan_backlog, args=(task_id, self.config[task_id]),
+                             name=f"BacklogScan-{task_id}", daemon=True).start()
+
+    def reload(self):
+        """설정 파일을 다시 읽어 추가/삭제/변경된 작업의 감시와 대기열만 다시 만듭니다.
+
+        바뀌지 않은 작업과 실행 중인 작업에는 영향이 없습니다. 적용한 변경 내용을 반환하며,
+        설정 파일을 읽을 수 없거나 잘못된 경우 기존 설정을 유지하고 ValueError 를 발생시킵니다.
+        """
+        with self._reload_lock:
+            try:
+                config = read_config(self.config_path)
+            except (OSError, configparser.Error) as e:
+                raise ValueError(f"설정 파일을 읽을 수 없습니다: {e}") from e
+            try:
+                added, removed, changed = diff_tasks(self.config, config)
+            except (ValueError, configparser.Error) as e:
+                raise ValueError(f"[common] tasks 를 읽을 수 없습니다: {e}") from e
+            # 감시나 대기열을 바꾸기 전에 모든 값을 확인하고 새 대기열을 만들어, 잘못된 설정이 일부만 적용되지 않도록 함
+            errors = validate_config(config, added + changed)
+            if errors:
+                raise ValueError(', '.join(errors))
+            queues = self.task_manager.prepare_config(config, added + changed)
+            restart_required = [key for key in RESTART_KEYS
+                                if self.config.get('common', key, raw=True, fallback=None) !=
+                                config.get('common', key, raw=True, fallback=None)]
+            if restart_required:
+                self.logger.warning(f"다음 항목은 재시작해야 적용됩니다: {', '.join(restart_required)}")
+
+            for task_id in removed + changed:
+                self._unwatch_task(task_id)
+            self.task_manager.apply_config(config, added, removed, changed, queues)
+            self.config = config
+            for task_id in changed + added:
+                try:
+                    self._watch_task(task_id, config[task_id])
+                except OSError as e:
+                    # 확인 후 폴더가 사라진 경우에도 나머지 작업의 감시는 계속 시작
+                    self.logger.error(f"[{config[task_id]['name']}] 폴더 감시를 시작하지 못했습니다: {e}")
+            # 다시 시작한 작업의 유입 폴더만 확인 (대기열에 이미 있는 파일은 중복으로 걸러짐)
+            self._start_backlog(changed + added)
+            self.logger.info(f"설정을 다시 읽었습니다. (추가: {added or '-'}, 삭제: {removed or '-'}, 변경: {changed or '-'})")
+            return {'added': added, 'removed': removed, 'changed': changed, 'restart_required': restart_required}
+
+    def _scan_backlog(self, task_id, task_config):
+        self.logger.info(f"[{task_config['name']}] 시작 시 기존 파일 처리 중...")
+        count = 0
+        try:
+            with os.scandir(task_config['in']) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    # 이미 이벤트로 제출된 파일은 TaskManager 에서 중복으로 걸러짐
+                    if self.task_manager.submit_task(task_id, entry.path, block=True):
+                        count += 1
+        except FileNotFoundError:
+             self.logger.error(f"유입 폴더를 찾을 수 없어 기존 파일을 처리할 수 없습니다: {task_config['in']}")
+        self.logger.info(f"[{task_config['name']}] 기존 파일 {count}개를 대기열에 넣었습니다.")
+
     def stop(self):
+        """감시를 멈춰 새 파일을 받지 않고, 실행 중인 작업을 drain_timeout 초까지 기다린 뒤 작업 관리자를 종료합니다."""
+        with self._reload_lock:
+            for _, watch in self.watches.values():
+                if isinstance(watch, PollingWatcher):
+                    watch.stop()
         if self.observer.is_alive():
             self.observer.stop()
             self.observer.join()
-        self.logger.info("모든 감시 서비스가 중단되었습니다.")
\ No newline at end of file
+        self.readiness.stop()
+        self.logger.info("모든 감시 서비스가 중단되었습니다.")
+        self.task_manager.drain(self.config.getfloat('common', 'drain_timeout', fallback=DEFAULT_DRAIN_TIMEOUT))
+        self.task_manager.close()
@@ -2,18 +2,30 @@
 import logging
 import os
 import sys
+import hmac
+import json
+import queue
 import signal
 import time
-import shutil
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, Response, render_template, send_file, request, redirect, url_for, session, flash, jsonify
 from .auth import login_required, check_credentials
 from .config import get_config_path
+from .file_router import move_file
+from .log_index import LEVELS, LogFollower, get_index, tail_lines
 
 app_config = None
+task_manager = None
 pids_dir = None
 logs_dir = None
 software_version = "1.0.0"
 
+STATUS_LABELS = {'queued': "대기", 'running': "실행중", 'done': "완료", 'failed': "중단"}
+SSE_KEEPALIVE_SECONDS = 15
+LOG_TAIL_LINES = 500
+LOG_PAGE_MAX = 1000
+LOG_FOLLOW_INTERVAL = 0.5   # 초
+JOB_OUTPUT_INTERVAL = 0.5   # 초
+
 def resource_path(relative_path):
     """Get the absolute path to the resource, works for development and production."""
     try:
@@ -22,9 +34,90 @@ def resource_path(relative_path):
         base_path = '..'
     return os.path.join(base_path, relative_path)
 
-def create_app(config):
-    global app_config, pids_dir, logs_dir
+def current_config():
+    """현재 설정을 반환합니다. 설정을 다시 읽으면 task_manager 가 새 설정을 가집니다."""
+    return task_manager.config if task_manager is not None else app_config
+
+def job_row(job, now=None):
+    """registry 의 작업 정보를 대시보드 행 형식으로 변환합니다."""
+    now = now or time.time()
+    running = job['state'] in ('queued', 'running')
+    return {
+        "job_id": job['job_id'],
+        "task_id": job['task_id'],
+        "task_name": current_config().get(job['task_id'], 'name', fallback=f"Task {job['task_id']}"),
+        "file_name": job['file_name'],
+        "status": STATUS_LABELS[job['state']],
+        "pid": job['pid'] if running else None,
+        "elapsed_seconds": now - (job['started_at'] or job['queued_at']) if running else None
+    }
+
+def history_row(item):
+    ts, task_id, file_name, status = item
+    return {
+        "task_id": task_id,
+        "task_name": current_config().get(task_id, 'name', fallback=f"Task {task_id}"),
+        "file_name": file_name,
+        "status": STATUS_LABELS[status],
+        "finished_at": ts
+    }
+
+def status_rows():
+    """대시보드에 표시할 전체 작업 목록을 만듭니다."""
+    all_files = []
+    if task_manager is None:
+        return all_files
+
+    now = time.time()
+    registry = task_manager.registry
+    for job in registry.running() + registry.queued(limit_per_task=20):
+        all_files.append(job_row(job.to_dict(), now))
+
+    config = current_config()
+    num_tasks = config.getint('common', 'tasks', fallback=0)
+    for i in range(num_tasks):
+        task_id = str(i)
+        if task_id in config:
+            for status in ('done', 'failed'):
+                for _, _, file_name, _ in task_manager.history.recent(task_id, status, 20):
+                    all_files.append({
+                        "task_id": task_id,
+                        "task_name": config[task_id].get('name', f"Task {task_id}"),
+                        "file_name": file_name,
+                        "status": STATUS_LABELS[status],
+                        "pid": None,
+                        "elapsed_seconds": None
+                    })
+
+    return all_files
+
+def cluster_status():
+    """모든 노드의 heartbeat 를 합친 클러스터 상태를 만듭니다."""
+    cluster = task_manager.cluster if task_manager is not None else None
+    if cluster is None:
+        return {"node": None, "nodes": [], "files": status_rows()}
+    now = time.time()
+    nodes = cluster.nodes()
+    files = [dict(row, node=cluster.node_id) for row in status_rows()]
+    for node in nodes:
+        if node['self'] or not node['alive']:
+            continue
+        for job in node.get('running', []):
+            files.append({
+                "task_id": job['task_id'],
+                "task_name": current_config().get(job['task_id'], 'name', fallback=f"Task {job['task_id']}"),
+                "file_name": job['file_name'],
+                "status": STATUS_LABELS['running'],
+                "pid": job['pid'],
+                "elapsed_seconds": now - job['started_at'] if job['started_at'] else None,
+                "node": node['node']
+            })
+    return {"node": cluster.node_id, "nodes": nodes, "files": files}
+
+def create_app(config, manager=None, reload_config=None):
+    global app_config, task_manager, pids_dir, logs_dir
     app_config = config
+    task_manager = manager
     pids_dir = app_config.get('common', 'pids')
     logs_dir = app_config.get('common', 'logs')
 
@@ -36,7 +129,7 @@ def create_app(config):
         if request.method == 'POST':
             username = request.form['username']
             password = request.form['password']
-            if check_credentials(username, password, app_config):
+            if check_credentials(username, password, current_config()):
                 session['logged_in'] = True
                 flash('로그인되었습니다.', 'success')
                 return redirect(url_for('dashboard'))
@@ -55,64 +148,132 @@ def create_app(config):
     def dashboard():
         return render_template('dashboard.html', title="대시보드")
         
+    @app.route('/metrics')
+    def metrics():
+        # 수집기(Prometheus)용이므로 로그인 대신 [common] metrics_token 이 설정된 경우에만 Bearer 토큰을 확인
+        token = current_config().get('common', 'metrics_token', fallback='')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            return Response("Unauthorized\n", status=401, mimetype='text/plain')
+        if task_manager is None:
+            return Response("Task manager is not running\n", status=503, mimetype='text/plain')
+        return Response(task_manager.metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
     @app.route('/api/status')
     @login_required
     def api_status():
-        all_files = []
-        num_tasks = app_config.getint('common', 'tasks', fallback=0)
-        
-        if os.path.isdir(pids_dir):
-            for pid_filename in os.listdir(pids_dir):
-                if pid_filename.endswith('.pid'):
+        # ?view=cluster 이면 다른 노드에서 실행 중인 작업과 노드별 상태를 함께 반환
+        if request.args.get('view') == 'cluster':
+            return jsonify(cluster_status())
+        return jsonify(status_rows())
+
+    @app.route('/api/events')
+    @login_required
+    def api_events():
+        # 상태 변경을 Server-Sent Events 로 전달. 접속 시 전체 목록을 한 번 보내고 이후에는 변경분만 전송
+        if task_manager is None:
+            return jsonify({"error": "Task manager is not running"}), 503
+        registry = task_manager.registry
+        subscriber = registry.subscribe()
+
+        def sse(event, data):
+            return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        def stream():
+            try:
+                yield sse('snapshot', status_rows())
+                while registry.is_subscribed(subscriber):
                     try:
-                        parts = pid_filename.rsplit('.pid', 1)[0].split('-', 1)
-                        if len(parts) != 2: continue
-                        
-                        task_id, original_filename = parts
-                        task_name = app_config.get(task_id, 'name', fallback=f"Task {task_id}")
-                        
-                        pid_file_path = os.path.join(pids_dir, pid_filename)
-                        with open(pid_file_path) as f:
-                            pid = int(f.read().strip())
-                        
-                        mtime = os.path.getmtime(pid_file_path)
-                        elapsed_seconds = time.time() - mtime
-                        
-                        all_files.append({
-                            "task_id": task_id,
-                            "task_name": task_name,
-                            "file_name": original_filename,
-                            "status": "실행중",
-                            "pid": pid,
-                            "elapsed_seconds": elapsed_seconds
-                        })
-                    except (IOError, ValueError, IndexError):
+                        event_type, job = subscriber.get(timeout=SSE_KEEPALIVE_SECONDS)
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
                         continue
-        
+                    yield sse(event_type, job_row(job))
+            finally:
+                registry.unsubscribe(subscriber)
+
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        return Response(stream(), mimetype='text/event-stream', headers=headers)
+
+    @app.route('/api/jobs/<int:job_id>/output')
+    @login_required
+    def api_job_output(job_id):
+        # 작업의 stdout/stderr 를 Server-Sent Events 로 전달. 메모리의 최근 줄을 먼저 보내고 종료될 때까지 이어서 전송
+        if task_manager is None:
+            return jsonify({"error": "Task manager is not running"}), 503
+        output, path = task_manager.outputs.get(job_id)
+        if output is None and (path is None or not os.path.exists(path)):
+            return jsonify({"error": "작업 출력을 찾을 수 없습니다."}), 404
+
+        def sse(event, data):
+            return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        def stream():
+            if output is None:
+                # 메모리에서 밀려난 종료된 작업은 spill 파일 끝부분을 보냄
+                yield sse('lines', tail_lines(path, LOG_TAIL_LINES))
+                yield sse('end', {})
+                return
+            seq = 0
+            idle = 0.0
+            while True:
+                lines, seq, closed = output.since(seq)
+                if lines:
+                    idle = 0.0
+                    yield sse('lines', [text for _, text in lines])
+                if closed:
+                    yield sse('end', {"truncated": output.truncated})
+                    return
+                if idle >= SSE_KEEPALIVE_SECONDS:
+                    idle = 0.0
+                    yield ": keepalive\n\n"
+                time.sleep(JOB_OUTPUT_INTERVAL)
+                idle += JOB_OUTPUT_INTERVAL
+
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        return Response(stream(), mimetype='text/event-stream', headers=headers)
+
+    @app.route('/api/jobs/<int:job_id>/output.log')
+    @login_required
+    def api_job_output_file(job_id):
+        # 전체 출력(spill 파일) 내려받기
+        if task_manager is None:
+            return jsonify({"error": "Task manager is not running"}), 503
+        _, path = task_manager.outputs.get(job_id)
+        if path is None or not os.path.exists(path):
+            return jsonify({"error": "작업 출력을 찾을 수 없습니다."}), 404
+        return send_file(path, mimetype='text/plain', as_attachment=True, download_name=os.path.basename(path))
+
+    @app.route('/api/history')
+    @login_required
+    def api_history():
+        # 완료/중단 이력 조회 (최신순, 페이지 단위)
+        if task_manager is None:
+            return jsonify({"error": "Task manager is not running"}), 503
+        status = request.args.get('status') or None
+        if status not in (None, 'done', 'failed'):
+            return jsonify({"error": "status must be 'done' or 'failed'"}), 400
+        offset = max(0, request.args.get('offset', 0, type=int))
+        limit = min(max(1, request.args.get('limit', 50, type=int)), 200)
+        total, items = task_manager.history.query(
+            task_id=request.args.get('task_id') or None,
+            status=status,
+            search=request.args.get('q') or None,
+            offset=offset,
+            limit=limit
+        )
+        return jsonify({"total": total, "offset": offset, "limit": limit, "items": [history_row(item) for item in items]})
+
+    @app.route('/history')
+    @login_required
+    def view_history():
+        tasks = []
+        config = current_config()
+        num_tasks = config.getint('common', 'tasks', fallback=0)
         for i in range(num_tasks):
             task_id = str(i)
-            if task_id in app_config:
-                task = app_config[task_id]
-                task_name = task.get('name', f"Task {task_id}")
-
-                def get_files(folder, status):
-                    if not os.path.isdir(folder): return
-                    for filename in os.listdir(folder)[-20:]:
-                        if filename.startswith('.'):
-                            continue
-                        all_files.append({
-                            "task_id": task_id,
-                            "task_name": task_name,
-                            "file_name": filename,
-                            "status": status,
-                            "pid": None,
-                            "elapsed_seconds": None
-                        })
-                
-                get_files(task['done'], "완료")
-                get_files(task['stop'], "중단")
-                
-        return jsonify(all_files)
+            if task_id in config:
+                tasks.append((task_id, config[task_id].get('name', f"Task {task_id}")))
+        return render_template('history.html', title="이력", tasks=tasks)
 
     @app.route('/api/retry', methods=['POST'])
     @login_required
@@ -126,13 +287,16 @@ def create_app(config):
             return jsonify({"success": False, "error": "Missing task_id or file_name"}), 400
 
         try:
-            task_config = app_config[task_id]
+            task_config = current_config()[task_id]
             stop_path = os.path.join(task_config['stop'], file_name)
             in_path = os.path.join(task_config['in'], file_name)
 
             if os.path.exists(stop_path):
-                shutil.copy(stop_path, in_path)
-                os.unlink(stop_path)
+                # 원자적으로 옮긴 뒤 감시 이벤트를 기다리지 않고 바로 대기열에 넣음
+                move_file(stop_path, in_path)
+                if task_manager is not None:
+                    task_manager.history.remove(task_id, file_name, 'failed')
+                    task_manager.submit_task(task_id, in_path)
                 logging.info(f"재시도 요청: '{file_name}'을(를) '{task_config['in']}' 폴더로 이동했습니다.")
                 return jsonify({"success": True})
             else:
@@ -144,28 +308,107 @@ def create_app(config):
     @app.route('/stop_task/<int:pid>', methods=['POST'])
     @login_required
     def stop_task(pid):
+        if task_manager is not None and task_manager.registry.find_pid(pid) is None:
+            return jsonify({"success": False, "error": "No running job with this pid"}), 404
         try:
-            os.kill(pid, signal.SIGTERM)
+            # 실행 중인 작업은 자체 세션(프로세스 그룹)으로 시작되므로 app 이 만든 하위 프로세스까지 함께 중단
+            if os.getpgid(pid) == pid:
+                os.killpg(pid, signal.SIGTERM)
+            else:
+                os.kill(pid, signal.SIGTERM)
         except Exception as e:
             logging.error(f"프로세스 중단 중 오류 발생: {e}")
         return jsonify({"success": True})
 
+    def log_file_list():
+        if not os.path.isdir(logs_dir):
+            return []
+        return sorted([f for f in os.listdir(logs_dir) if 'folder-watcher' in f], reverse=True)
+
+    def selected_log_path():
+        # 목록에 있는 파일만 허용 (경로 조작 방지)
+        log_files = log_file_list()
+        selected_log = request.args.get('file', log_files[0] if log_files else None)
+        if selected_log not in log_files:
+            return None
+        return os.path.join(logs_dir, selected_log)
+
+    def log_filters():
+        return {
+            'min_level': LEVELS.get(request.args.get('level', '').upper(), 0),
+            'task': request.args.get('task') or None,
+            'text': request.args.get('q') or None,
+        }
+
     @app.route('/logs')
     @login_required
     def view_logs():
-        log_files = []
-        if os.path.isdir(logs_dir):
-            log_files = sorted([f for f in os.listdir(logs_dir) if 'folder-watcher' in f], reverse=True)
-        
+        log_files = log_file_list()
         selected_log = request.args.get('file', log_files[0] if log_files else None)
         log_content = ""
         if selected_log and selected_log in log_files:
             try:
-                with open(os.path.join(logs_dir, selected_log), 'r', encoding='utf-8') as f:
-                    log_content = "".join(f.readlines()[-500:])
+                # 파일 끝에서부터 필요한 만큼만 읽음
+                log_content = "\n".join(tail_lines(os.path.join(logs_dir, selected_log), LOG_TAIL_LINES))
             except Exception as e:
                 log_content = f"로그 파일 읽기 오류: {e}"
-        return render_template('logs.html', title="로그", log_files=log_files, selected_log=selected_log, log_content=log_content)
+        config = current_config()
+        task_names = [config[str(i)].get('name', f"Task {i}")
+                      for i in range(config.getint('common', 'tasks', fallback=0)) if str(i) in config]
+        return render_template('logs.html', title="로그", log_files=log_files, selected_log=selected_log,
+                               log_content=log_content, task_names=task_names, levels=list(LEVELS))
+
+    @app.route('/api/logs')
+    @login_required
+    def api_logs():
+        # 레벨/작업/검색어로 거른 줄을 최신 순으로 페이지 단위 반환. 다음 페이지는 응답의 before 로 요청
+        path = selected_log_path()
+        if path is None:
+            return jsonify({"error": "로그 파일을 찾을 수 없습니다."}), 404
+        try:
+            before = request.args.get('before', type=int)
+            limit = max(1, min(request.args.get('limit', 200, type=int), LOG_PAGE_MAX))
+            lines, before = get_index(path).query(before=before, limit=limit, **log_filters())
+        except OSError as e:
+            return jsonify({"error": f"로그 파일 읽기 오류: {e}"}), 500
+        return jsonify({"lines": lines, "before": before})
+
+    @app.route('/api/logs/follow')
+    @login_required
+    def api_logs_follow():
+        # 파일에 추가되는 줄을 Server-Sent Events 로 전달
+        path = selected_log_path()
+        if path is None:
+            return jsonify({"error": "로그 파일을 찾을 수 없습니다."}), 404
+        follower = LogFollower(path, **log_filters())
+
+        def stream():
+            idle = 0.0
+            while True:
+                lines = follower.poll()
+                if lines:
+                    idle = 0.0
+                    yield f"event: lines\ndata: {json.dumps(lines, ensure_ascii=False)}\n\n"
+                elif idle >= SSE_KEEPALIVE_SECONDS:
+                    idle = 0.0
+                    yield ": keepalive\n\n"
+                time.sleep(LOG_FOLLOW_INTERVAL)
+                idle += LOG_FOLLOW_INTERVAL
+
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        return Response(stream(), mimetype='text/event-stream', headers=headers)
+
+    @app.route('/api/reload', methods=['POST'])
+    @login_required
+    def reload_settings():
+        # 설정 파일을 다시 읽어 추가/삭제/변경된 작업만 다시 시작
+        if reload_config is None:
+            return jsonify({"success": False, "error": "Reload is not available"}), 503
+        try:
+            changes = reload_config()
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify(dict(changes, success=True))
 
     @app.route('/config')
     @login_required
@@ -0,0 +1,166 @@
+# 요구사항: PR-0001, FR-0008
+import asyncio
+import itertools
+import json
+import logging
+
+STREAM_LIMIT = 1024 * 1024      # 응답 한 줄의 최대 크기
+PING_TIMEOUT = 10               # 초
+
+class WorkerError(Exception):
+    """작업자 프로세스가 응답하지 않거나 종료된 경우 발생합니다."""
+
+
+class Worker:
+    """stdin/stdout 으로 한 줄 단위 JSON 을 주고받는 상주 작업자 프로세스입니다.
+
+    요청: {"id": 1, "files": ["/path/a", ...]}  또는 상태 확인용 {"id": 2, "ping": true}
+    응답: {"id": 1, "exit_code": 0} 또는 {"id": 1, "results": {"/path/a": 0, ...}}
+    JSON 이 아닌 출력 줄은 작업자 로그로 기록합니다.
+    """
+    def __init__(self, name, process):
+        self.name = name
+        self.process = process
+        self.pid = process.pid
+        self.jobs = 0
+        self._ids = itertools.count(1)
+
+    def alive(self):
+        return self.process.returncode is None
+
+    async def call(self, message, timeout=None):
+        message = dict(message, id=next(self._ids))
+        try:
+            self.process.stdin.write((json.dumps(message) + '\n').encode('utf-8'))
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise WorkerError(f"작업자(PID {self.pid})에 요청을 보낼 수 없습니다: {e}")
+        try:
+            return await asyncio.wait_for(self._read_reply(message['id']), timeout or None)
+        except asyncio.TimeoutError:
+            raise WorkerError(f"작업자(PID {self.pid})가 {timeout}초 안에 응답하지 않았습니다.")
+
+    async def _read_reply(self, request_id):
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                raise WorkerError(f"작업자(PID {self.pid})가 종료되었습니다.")
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                logging.info(f"[{self.name}] 작업자 {self.pid}: {line.decode('utf-8', 'replace').rstrip()}")
+                continue
+            if isinstance(reply, dict) and reply.get('id') == request_id:
+                return reply
+
+    async def stop(self, kill=False):
+        """stdin 을 닫아 종료를 요청하고, 응답이 없거나 kill 이 True 이면 강제 종료합니다."""
+        if not self.alive():
+            return
+        try:
+            if not kill:
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), 5)
+                return
+        except (asyncio.TimeoutError, OSError):
+            pass
+        try:
+            self.process.kill()
+        except ProcessLookupError:
+            pass
+        await self.process.wait()
+
+
+class WorkerPool:
+    """작업(섹션) 하나의 상주 작업자 프로세스를 관리합니다 (mode = persistent).
+
+    작업자는 필요할 때 최대 size 개까지 시작하며, max_jobs_per_worker 건을 처리하면
+    재시작합니다. 유휴 작업자는 health_interval 마다 ping 으로 상태를 확인합니다.
+    """
+    def __init__(self, name, command, size, max_jobs_per_worker=0, job_timeout=0, health_interval=30):
+        self.name = name
+        self.command = command
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.health_interval = health_interval
+        self._idle = []
+        self._count = 0
+        self._cond = asyncio.Condition()
+        self._health_task = None
+        self._closed = False
+
+    async def acquire(self):
+        """유휴 작업자를 가져오거나, 여유가 있으면 새 작업자를 시작합니다."""
+        async with self._cond:
+            while True:
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._count -= 1
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                await self._cond.wait()
+        try:
+            return await self._spawn()
+        except Exception:
+            async with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    async def _spawn(self):
+        process = await asyncio.create_subprocess_exec(
+            *self.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=STREAM_LIMIT)
+        logging.info(f"[{self.name}] 상주 작업자를 시작했습니다. (PID {process.pid})")
+        if self._health_task is None and self.health_interval > 0:
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+        return Worker(self.name, process)
+
+    async def release(self, worker, healthy=True):
+        """작업자를 반환합니다. 비정상이거나 처리 한도에 도달한 작업자는 종료합니다."""
+        retire = self._closed or not healthy or not worker.alive() or \
+            (self.max_jobs_per_worker > 0 and worker.jobs >= self.max_jobs_per_worker)
+        if retire:
+            if worker.alive():
+                logging.info(f"[{self.name}] 작업자를 재시작합니다. (PID {worker.pid}, 처리 {worker.jobs}건)")
+            await worker.stop(kill=not healthy)
+        async with self._cond:
+            if retire:
+                self._count -= 1
+            else:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    async def run(self, worker, files):
+        """파일 목록을 작업자에게 보내고 (종료 코드, {파일: 종료 코드}) 를 반환합니다."""
+        reply = await worker.call({'files': files}, self.job_timeout)
+        worker.jobs += 1
+        results = reply.get('results') or {}
+        return reply.get('exit_code', 0 if results else None), results
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            async with self._cond:
+                workers, self._idle = self._idle, []
+            for worker in workers:
+                healthy = False
+                try:
+                    await worker.call({'ping': True}, PING_TIMEOUT)
+                    healthy = True
+                except WorkerError as e:
+                    logging.warning(f"[{self.name}] 작업자 상태 확인 실패: {e}")
+                await self.release(worker, healthy)
+
+    async def close(self):
+        """유휴 작업자를 종료합니다. 처리 중인 작업자는 처리가 끝나 반환될 때 종료합니다."""
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+        async with self._cond:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            await worker.stop()